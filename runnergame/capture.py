@@ -0,0 +1,96 @@
+# capture.py
+
+import queue
+import threading
+import time
+
+class FrameCapture:
+    """
+    Records the display surface to a raw video file. Frames are copied
+    into a fixed ring of buffers on the render thread and written to
+    disk by a background thread.
+    """
+
+    def __init__(self, surface, path, num_buffers):
+        """
+        Allocates the frame buffers and starts the writer thread.
+
+        Args:
+            surface (pygame.Surface): The display surface to capture.
+            path (str): Path of the raw video file; frames are appended.
+            num_buffers (int): Number of frames that can wait to be
+                written before new frames are dropped.
+        """
+        self.surface = surface
+        self.path = path
+        self.buffers = [memoryview(bytearray(
+            surface.get_pitch() * surface.get_height()))
+            for _ in range(num_buffers)]
+        self.free = queue.SimpleQueue()
+        self.ready = queue.SimpleQueue()
+        for index in range(num_buffers):
+            self.free.put(index)
+        self.captured = 0
+        self.dropped = 0
+        self.max_pending = 0
+        self.copy_time = 0
+        self.file = open(path, "ab")
+        self.writer = threading.Thread(target=self.write_frames, daemon=True)
+        self.writer.start()
+
+    def capture(self):
+        """
+        Copies the current contents of the surface into a free buffer,
+        or drops the frame if the writer has fallen behind.
+        """
+        start = time.perf_counter()
+        try:
+            index = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+        with memoryview(self.surface.get_view("1")) as view:
+            self.buffers[index][:] = view.cast("B")
+        self.ready.put(index)
+        self.captured += 1
+        self.max_pending = max(self.max_pending, self.ready.qsize())
+        self.copy_time += time.perf_counter() - start
+
+    def write_frames(self):
+        """Writes captured frames to the file until closed."""
+        while (index := self.ready.get()) is not None:
+            self.file.write(self.buffers[index])
+            self.free.put(index)
+
+    def close(self):
+        """Writes the remaining frames, closes the file, and reports."""
+        self.ready.put(None)
+        self.writer.join()
+        self.file.close()
+        self.report()
+
+    def pixel_format(self):
+        """
+        Describes the byte order of captured pixels.
+
+        Returns:
+            str: An ffmpeg pixel format name such as "bgr0" for 32-bit
+            surfaces, otherwise the bit depth.
+        """
+        if self.surface.get_bytesize() != 4:
+            return f"{self.surface.get_bitsize()}-bit"
+        channels = {shift: name for shift, mask, name in zip(
+            self.surface.get_shifts(), self.surface.get_masks(), "rgba")
+            if mask}
+        return "".join(channels.get(8 * byte, "0") for byte in range(4))
+
+    def report(self):
+        """Prints the capture and back-pressure statistics."""
+        copy_ms = 1000 * self.copy_time / max(self.captured, 1)
+        width, height = self.surface.get_size()
+        print(f"Captured {self.captured} frames to {self.path} "
+              f"({self.pixel_format()}, {width}x{height}, "
+              f"pitch {self.surface.get_pitch()})")
+        print(f"Dropped {self.dropped} frames, at most {self.max_pending} "
+              f"of {len(self.buffers)} buffers pending, "
+              f"{copy_ms:.3f} ms per copy")
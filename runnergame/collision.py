@@ -0,0 +1,91 @@
+# collision.py
+
+import math
+from constants import COLLISION_STEP
+
+def sweep_axis(start, end, other_start, other_end, velocity):
+    """
+    Finds when a moving interval overlaps a stationary one.
+
+    Args:
+        start (float): Start of the stationary interval.
+        end (float): End of the stationary interval.
+        other_start (float): Start of the moving interval at time 0.
+        other_end (float): End of the moving interval at time 0.
+        velocity (float): Distance the moving interval travels by time 1.
+
+    Returns:
+        tuple[float, float]: Entry and exit times of the overlap; entry
+        is greater than exit if the intervals never overlap.
+    """
+    if velocity > 0:
+        return ((start - other_end) / velocity,
+                (end - other_start) / velocity)
+    if velocity < 0:
+        return ((end - other_start) / velocity,
+                (start - other_end) / velocity)
+    if other_start < end and other_end > start:
+        return -math.inf, math.inf
+    return math.inf, -math.inf
+
+def swept_collide(player, obstacle, image_manager):
+    """
+    Checks whether two sprites touched at any point while moving from
+    their previous rects to their current ones. The bounding boxes are
+    swept against each other first, and the sprite masks are compared
+    only over the part of the frame in which the boxes overlap.
+
+    Args:
+        player (pygame.sprite.Sprite): The player sprite.
+        obstacle (pygame.sprite.Sprite): The obstacle sprite.
+        image_manager (ImageManager): Provides cached sprite masks.
+
+    Returns:
+        bool: True if the sprites collided during the frame.
+    """
+    # The player animates around a fixed left and bottom edge, so its
+    # motion is measured there; obstacles animate around their center.
+    player_dx = player.rect.left - player.last_rect.left
+    player_dy = player.rect.bottom - player.last_rect.bottom
+    obstacle_dx = obstacle.rect.centerx - obstacle.last_rect.centerx
+    obstacle_dy = obstacle.rect.centery - obstacle.last_rect.centery
+    start = player.rect.move(-player_dx, -player_dy)
+    other = obstacle.rect.move(-obstacle_dx, -obstacle_dy)
+    dx = obstacle_dx - player_dx
+    dy = obstacle_dy - player_dy
+
+    enter_x, exit_x = sweep_axis(start.left, start.right,
+                                 other.left, other.right, dx)
+    enter_y, exit_y = sweep_axis(start.top, start.bottom,
+                                 other.top, other.bottom, dy)
+    enter = max(enter_x, enter_y, 0)
+    leave = min(exit_x, exit_y, 1)
+    if enter >= leave:
+        return False
+
+    player_mask = image_manager.get_mask(player.surf)
+    obstacle_mask = image_manager.get_mask(obstacle.surf)
+    steps = max(1, math.ceil(math.hypot(dx, dy) * (leave - enter)
+                             / COLLISION_STEP))
+    for step in range(steps + 1):
+        t = enter + (leave - enter) * step / steps
+        offset = (round(other.x + obstacle_dx * t - start.x - player_dx * t),
+                  round(other.y + obstacle_dy * t - start.y - player_dy * t))
+        if player_mask.overlap(obstacle_mask, offset):
+            return True
+    return False
+
+def collide_any(player, obstacles, image_manager):
+    """
+    Checks for a swept collision between the player and any obstacle.
+
+    Args:
+        player (pygame.sprite.Sprite): The player sprite.
+        obstacles (pygame.sprite.Group): The obstacle sprites.
+        image_manager (ImageManager): Provides cached sprite masks.
+
+    Returns:
+        bool: True if the player collided with an obstacle.
+    """
+    return any(swept_collide(player, obstacle, image_manager)
+               for obstacle in obstacles)
@@ -17,6 +17,7 @@ FLOOR = HEIGHT - GROUND_DIM
 
 # Game mechanics
 FPS = 30
+MENU_FPS = 15
 JUMP_SPEED = int(5 + 2 * GAME_SCALE)
 DEFAULT_SPEED = int(9 * GAME_SCALE)
 SPEED_INCREMENT = 0.35
@@ -39,6 +40,12 @@ SCORECOUNT = ADDOBSTACLE + 1
 DURATION = SCORECOUNT + 1
 SPEEDUP = DURATION + 1
 FRAMECHANGE = SPEEDUP + 1
+FOCUS_LOST_EVENTS = [pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED, 
+                     pygame.WINDOWHIDDEN]
+FOCUS_GAINED_EVENTS = [pygame.WINDOWFOCUSGAINED, pygame.WINDOWRESTORED, 
+                       pygame.WINDOWSHOWN]
+GAME_EVENTS = [pygame.QUIT, pygame.KEYDOWN, 
+               *FOCUS_LOST_EVENTS, *FOCUS_GAINED_EVENTS]
 
 SCORECOUNT_OFFSET = 250
 DURATION_OFFSET = 1000
@@ -48,7 +55,67 @@ FRAMECHANGE_OFFSET = 75
 TIMER_MIN = int(790 * game_scale)
 TIMER_MAX = int(1600 * game_scale)
 
+# Spawn schedule
+SPAWN_CHUNK = 32
+SPAWN_LOW_WATER = 8
+SPAWN_ATTEMPTS = 16
+SPAWN_SLACK = 2
+
 # Scaling
 PLAYER_SCALE = [1 * GAME_SCALE] * 2
 OBSTACLE_SCALE = [1.5 * GAME_SCALE] * 2
-GLOW_SCALE = [2.3 * ((1 / GAME_SCALE) if GAME_SCALE < 1 else GAME_SCALE)] * 2
\ No newline at end of file
+GLOW_SCALE = [2.3 * ((1 / GAME_SCALE) if GAME_SCALE < 1 else GAME_SCALE)] * 2
+
+# Collision
+COLLISION_STEP = 4
+
+# Memory
+MEMORY_BUDGET_MB = 64
+RLE_MIN_TRANSPARENCY = 0.25
+MEMORY_REPORT = False
+
+# Latency probe
+LATENCY_PROBE = False
+LATENCY_BUCKET_MS = 5
+
+# Quality
+QUALITY_TIERS = {
+    "low": {"layers": 2, "glow": False, "resolution": 0.5, 
+            "hud_interval": 1000},
+    "medium": {"layers": 3, "glow": True, "resolution": 0.75, 
+               "hud_interval": 250},
+    "high": {"layers": None, "glow": True, "resolution": 1, 
+             "hud_interval": 0},
+}
+QUALITY_WINDOW = 90
+CALIBRATION_FRAMES = 20
+CALIBRATION_HEADROOM = 0.5
+QUALITY_RAISE_WINDOWS = 4
+QUALITY_REPORT = False
+
+# Controller
+CONTROLLER_BAUD = 9600
+CONTROLLER_READ_TIMEOUT = 0.1
+CONTROLLER_BUTTONS = 2
+CONTROLLER_SAMPLES = 1000
+JUMP_BUTTON = 0
+ESCAPE_BUTTON = 1
+
+# Idle reporting
+IDLE_REPORT = False
+
+# Capture
+CAPTURE = False
+CAPTURE_PATH = "capture.raw"
+CAPTURE_BUFFERS = 8
+
+# Server
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 5555
+SERVER_SESSIONS = 4
+CLIENT_BUFFER_LIMIT = 64 * 1024
+
+# Environment
+OBSERVED_OBSTACLES = 3
+MAX_OBSTACLES = 8
+NO_OBSTACLE = 2 * WIDTH
\ No newline at end of file
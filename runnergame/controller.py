@@ -0,0 +1,237 @@
+# controller.py
+
+import os
+import select
+from abc import ABC, abstractmethod
+import socket
+import threading
+import time
+from collections import deque
+from quality import percentile
+from constants import (CONTROLLER_BAUD, CONTROLLER_READ_TIMEOUT,
+                       CONTROLLER_BUTTONS, CONTROLLER_SAMPLES)
+
+class InputDevice(ABC):
+    """
+    Reads button states from an external controller on a background
+    thread. The controller sends one line per state change holding the
+    bitmask of pressed buttons. The latest state is kept in a single
+    slot that is replaced whole, so sampling it never waits on the
+    reader.
+    """
+
+    def __init__(self, name):
+        """
+        Initializes the device with no buttons pressed.
+
+        Args:
+            name (str): Describes the device in messages.
+        """
+        self.name = name
+        self.state = (0, (0,) * CONTROLLER_BUTTONS, None)
+        self.last_sampled = None
+        self.latencies = deque(maxlen=CONTROLLER_SAMPLES)
+        self.running = False
+        self.reader = threading.Thread(target=self.read_states, daemon=True)
+
+    def start(self):
+        """Starts the reader thread."""
+        self.running = True
+        self.reader.start()
+
+    def close(self):
+        """Stops the reader thread and closes the device."""
+        self.running = False
+        if self.reader.is_alive():
+            self.reader.join(CONTROLLER_READ_TIMEOUT * 2)
+
+    @abstractmethod
+    def read(self):
+        """
+        Reads available bytes, waiting at most CONTROLLER_READ_TIMEOUT.
+
+        Returns:
+            bytes | None: The bytes read, None if nothing arrived in
+            time, or an empty string if the device disconnected.
+        """
+
+    def read_states(self):
+        """Parses lines from the device and publishes each state."""
+        buffer = b""
+        try:
+            while self.running:
+                data = self.read()
+                if data is None:
+                    continue
+                if not data:
+                    print(f"Controller {self.name} disconnected")
+                    break
+                *lines, buffer = (buffer + data).split(b"\n")
+                for line in lines:
+                    try:
+                        self.publish(int(line))
+                    except ValueError:
+                        pass
+        except OSError as e:
+            print(f"Error reading controller {self.name}: {e}")
+        finally:
+            self.running = False
+            self.disconnect()
+
+    @abstractmethod
+    def disconnect(self):
+        """Releases the underlying device."""
+
+    def publish(self, buttons):
+        """
+        Replaces the state slot, counting new presses of each button.
+
+        Args:
+            buttons (int): Bitmask of the pressed buttons.
+        """
+        previous, presses, _ = self.state
+        pressed = buttons & ~previous
+        presses = tuple(count + (pressed >> bit & 1)
+                        for bit, count in enumerate(presses))
+        self.state = (buttons, presses, time.perf_counter())
+
+    def sample(self):
+        """
+        Returns the latest state and records how long it waited in the
+        slot before the game loop first saw it.
+
+        Returns:
+            tuple[int, tuple[int, ...]]: Bitmask of pressed buttons and
+            the number of presses of each button so far.
+        """
+        state = self.state
+        buttons, presses, published = state
+        if published is not None and state is not self.last_sampled:
+            self.latencies.append((time.perf_counter() - published) * 1000)
+            self.last_sampled = state
+        return buttons, presses
+
+    def report(self):
+        """Prints the read-to-sample latency of recent controller reads."""
+        if not self.latencies:
+            return
+        samples = list(self.latencies)
+        print(f"Controller {self.name}: {len(samples)} reads, "
+              f"mean {sum(samples) / len(samples):.2f} ms, "
+              f"p95 {percentile(samples, 0.95):.2f} ms, "
+              f"max {max(samples):.2f} ms")
+
+
+class SerialInput(InputDevice):
+    """Reads a controller attached to a serial port or pseudo-terminal."""
+
+    def __init__(self, path, baudrate=CONTROLLER_BAUD):
+        """
+        Opens the serial port in raw mode.
+
+        Args:
+            path (str): Path to the serial device.
+            baudrate (int, optional): Line speed of the port.
+
+        Raises:
+            OSError: If the baud rate is not supported or the port
+                could not be opened or configured.
+        """
+        # termios is only available on POSIX systems.
+        import termios
+        import tty
+        speed = getattr(termios, f"B{baudrate}", None)
+        if speed is None:
+            raise OSError(f"Unsupported baud rate {baudrate}")
+        super().__init__(path)
+        self.fd = os.open(path, os.O_RDONLY | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            tty.setraw(self.fd)
+            attributes = termios.tcgetattr(self.fd)
+            attributes[4] = attributes[5] = speed
+            termios.tcsetattr(self.fd, termios.TCSANOW, attributes)
+        except termios.error as e:
+            os.close(self.fd)
+            raise OSError(*e.args) from e
+
+    def read(self):
+        """
+        Reads available bytes, waiting at most CONTROLLER_READ_TIMEOUT.
+
+        Returns:
+            bytes | None: The bytes read, None if nothing arrived in
+            time, or an empty string if the device disconnected.
+        """
+        ready, _, _ = select.select([self.fd], [], [], CONTROLLER_READ_TIMEOUT)
+        return os.read(self.fd, 256) if ready else None
+
+    def disconnect(self):
+        """Closes the serial port."""
+        os.close(self.fd)
+
+
+class SocketInput(InputDevice):
+    """Reads a controller bridged to a local TCP or Unix socket."""
+
+    def __init__(self, address):
+        """
+        Connects to the socket.
+
+        Args:
+            address (str): "host:port" for TCP, otherwise a Unix socket
+                path.
+        """
+        super().__init__(address)
+        host, _, port = address.rpartition(":")
+        if host and port.isdigit():
+            self.socket = socket.create_connection((host, int(port)))
+        else:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(address)
+        self.socket.settimeout(CONTROLLER_READ_TIMEOUT)
+
+    def read(self):
+        """
+        Reads available bytes, waiting at most CONTROLLER_READ_TIMEOUT.
+
+        Returns:
+            bytes | None: The bytes read, None if nothing arrived in
+            time, or an empty string if the device disconnected.
+        """
+        try:
+            return self.socket.recv(256)
+        except socket.timeout:
+            return None
+
+    def disconnect(self):
+        """Closes the socket."""
+        self.socket.close()
+
+
+def open_input_device(controller_config):
+    """
+    Opens and starts the controller described in the configuration.
+
+    Args:
+        controller_config (dict): The controller section of the
+            configuration, with either a "serial" device path and
+            optional "baudrate", or a "socket" address.
+
+    Returns:
+        InputDevice | None: The started device, or None if no controller
+        is configured or it could not be opened.
+    """
+    try:
+        if controller_config.get("serial"):
+            device = SerialInput(controller_config["serial"],
+                                 controller_config.get("baudrate",
+                                                       CONTROLLER_BAUD))
+        elif controller_config.get("socket"):
+            device = SocketInput(controller_config["socket"])
+        else:
+            return None
+    except (OSError, AttributeError, ImportError) as e:
+        print(f"Error opening controller: {e}")
+        return None
+    device.start()
+    return device
@@ -0,0 +1,37 @@
+# cpu_monitor.py
+
+import time
+
+class CpuMonitor:
+    """Measures the share of one core used by the process over a period."""
+
+    def __init__(self):
+        """Initializes the monitor and starts the first period."""
+        self.start()
+
+    def start(self):
+        """Starts a new measurement period."""
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+
+    def usage(self):
+        """
+        Calculates CPU use since the period started.
+
+        Returns:
+            tuple[float, float]: Seconds elapsed and the percentage of
+            one core used over that time.
+        """
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        return wall, 100 * cpu / wall if wall else 0
+
+    def report(self, label):
+        """
+        Prints CPU use since the period started.
+
+        Args:
+            label (str): Describes what the process was doing.
+        """
+        wall, percent = self.usage()
+        print(f"{label}: {wall:.1f} s at {percent:.1f}% CPU")
@@ -20,6 +20,7 @@ class Player(pygame.sprite.Sprite):
         self.rect = self.surf.get_rect()
         self.rect.left = int(WIDTH/7)
         self.rect.bottom = FLOOR
+        self.last_rect = self.rect.copy()
         self.run_imgs = menu.image_manager.run_imgs
         self.float_frames = 6
         self.wait = 0
@@ -52,6 +53,7 @@ class Player(pygame.sprite.Sprite):
         Returns:
             tuple[float, float, bool]: Updated input paramters.
         """
+        self.last_rect = self.rect.copy()
         if is_jumping == True:
             # Calculate jump force using the formula: F = 1/2 * m * v^2.
             F = (1 / 2) * m * (v**2)
@@ -89,18 +91,20 @@ class Player(pygame.sprite.Sprite):
 class Obstacle(pygame.sprite.Sprite):
     """Manages obstacle sprites, extending the Pygame Sprite class."""
 
-    def __init__(self, menu):
+    def __init__(self, menu, rng=random):
         """
         Initializes obstacle with the first image and sets its position.
 
         Args:
             menu (Menu): The central game menu system.
+            rng (random.Random, optional): Source of randomness for the
+                first animation frame. Defaults to the random module.
         """
         super(Obstacle, self).__init__()
         self.menu = menu
         self.len_obs = menu.image_manager.len_obs
 
-        self.frame = random.randint(0, self.len_obs - 1)
+        self.frame = rng.randint(0, self.len_obs - 1)
         self.num_frames = 4
         self.max_frames = (self.len_obs - 1) * self.num_frames
 
@@ -111,6 +115,7 @@ class Obstacle(pygame.sprite.Sprite):
             FLOOR - int(1.5 * self.menu.image_manager.obs_imgs
                         [int(self.len_obs/2)].get_height())))
         self.glow_rect = self.glow_surf.get_rect(center=self.rect.center)
+        self.last_rect = self.rect.copy()
 
     def update(self, speed):
         """
@@ -119,12 +124,14 @@ class Obstacle(pygame.sprite.Sprite):
         Args:
             speed (float): The speed at which the obstacle should move.
         """
+        self.last_rect = self.rect.copy()
         self.animate(self.rect.center)
         self.update_position(speed)
         self.frame += 1
 
-        # Remove the obstacle when it moves off screen.
-        if self.rect.right < 0:
+        # Remove the obstacle once it has been off screen for a whole
+        # frame, so the collision check still sees its last movement.
+        if self.last_rect.right < 0:
             self.kill()
     
     def animate(self, center):
@@ -0,0 +1,262 @@
+# environment.py
+
+import numpy as np
+from simulation import Simulation
+from spawn_schedule import SpawnSchedule
+from constants import (WIDTH, FLOOR, FPS, JUMP_SPEED, DEFAULT_SPEED,
+                       SPEED_INCREMENT, SCORECOUNT_OFFSET, SPEEDUP_OFFSET,
+                       OBSERVED_OBSTACLES, MAX_OBSTACLES, NO_OBSTACLE)
+
+NOOP = 0
+JUMP = 1
+
+class RunnerEnv:
+    """
+    Exposes a single game through reset and step calls for automated
+    players. Observations hold the player's height, jump velocity, jump
+    state and the game speed, followed by the distance from the player
+    to each of the nearest OBSERVED_OBSTACLES obstacles ahead of it, or
+    NO_OBSTACLE where there are fewer.
+    """
+
+    def __init__(self, image_manager):
+        """
+        Initializes the environment without a display.
+
+        Args:
+            image_manager (ImageManager): Provides sprite dimensions.
+        """
+        self.simulation = Simulation(image_manager)
+
+    def reset(self, seed=None):
+        """
+        Starts a new game.
+
+        Args:
+            seed (int, optional): Seed for the game's random numbers.
+
+        Returns:
+            numpy.ndarray: The first observation.
+        """
+        self.simulation.reset(seed)
+        return self.observe()
+
+    def step(self, action):
+        """
+        Applies an action and advances the game by one frame.
+
+        Args:
+            action (int): NOOP or JUMP.
+
+        Returns:
+            tuple[numpy.ndarray, int, bool, dict]: The observation, the
+            points scored this frame, whether the game ended, and the
+            total score.
+        """
+        simulation = self.simulation
+        if action == JUMP:
+            simulation.jump()
+        score = simulation.score
+        done = simulation.step()
+        return (self.observe(), simulation.score - score, done,
+                {"score": simulation.score})
+
+    def observe(self):
+        """
+        Builds the observation of the current frame.
+
+        Returns:
+            numpy.ndarray: The observation as float32 values.
+        """
+        simulation = self.simulation
+        player = simulation.player.rect
+        distances = sorted(obstacle.rect.left - player.right
+                           for obstacle in simulation.obstacles
+                           if obstacle.rect.right > player.left)
+        distances += [NO_OBSTACLE] * OBSERVED_OBSTACLES
+        return np.array([player.bottom, simulation.v, simulation.is_jumping,
+                         simulation.speed, *distances[:OBSERVED_OBSTACLES]],
+                        dtype=np.float32)
+
+
+class VectorRunnerEnv:
+    """
+    Steps a batch of independent games in lockstep using array
+    operations. Observations match RunnerEnv, one row per game. Each
+    game keeps the player and obstacles at the size of a single frame
+    of their animations and detects collisions with bounding boxes
+    swept over the frame, trading the exact sprite masks of RunnerEnv
+    for speed. Spawns are drawn from a SpawnSchedule per game, as in
+    RunnerEnv. Finished games are reset automatically.
+    """
+
+    def __init__(self, image_manager, num_envs):
+        """
+        Initializes the batch without a display.
+
+        Args:
+            image_manager (ImageManager): Provides sprite dimensions.
+            num_envs (int): Number of games in the batch.
+        """
+        player_img = image_manager.run_imgs[0]
+        obstacle_img = image_manager.obs_imgs[int(image_manager.len_obs / 2)]
+        self.num_envs = num_envs
+        self.frame_ms = 1000 / FPS
+        self.player_left = int(WIDTH / 7)
+        self.player_right = self.player_left + player_img.get_width()
+        self.player_height = player_img.get_height()
+        self.obstacle_width, self.obstacle_height = obstacle_img.get_size()
+        self.obstacle_top = (FLOOR - int(1.5 * obstacle_img.get_height())
+                             - self.obstacle_height // 2)
+        self.spawn_left = WIDTH + 20 - self.obstacle_width // 2
+
+        self.bottom = np.zeros(num_envs)
+        self.v = np.zeros(num_envs)
+        self.m = np.zeros(num_envs)
+        self.is_jumping = np.zeros(num_envs, dtype=bool)
+        self.elapsed = np.zeros(num_envs)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.speed = np.zeros(num_envs)
+        self.speedup_timer = np.zeros(num_envs)
+        self.spawn_timer = np.zeros(num_envs)
+        self.schedules = [SpawnSchedule(image_manager)
+                          for _ in range(num_envs)]
+        self.obstacle_left = np.zeros((num_envs, MAX_OBSTACLES))
+        self.next_slot = np.zeros(num_envs, dtype=np.int64)
+        self.rng = np.random.default_rng()
+
+    def reset(self, seed=None):
+        """
+        Starts a new game in every slot of the batch.
+
+        Args:
+            seed (int, optional): Seed for the batch's random numbers.
+
+        Returns:
+            numpy.ndarray: The first observation of each game.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self.observe()
+
+    def reset_envs(self, mask):
+        """
+        Starts new games in the selected slots.
+
+        Args:
+            mask (numpy.ndarray): Boolean mask of the games to reset.
+        """
+        self.bottom[mask] = FLOOR
+        self.v[mask] = JUMP_SPEED
+        self.m[mask] = 1
+        self.is_jumping[mask] = False
+        self.elapsed[mask] = 0
+        self.score[mask] = 0
+        self.speed[mask] = DEFAULT_SPEED
+        self.speedup_timer[mask] = SPEEDUP_OFFSET
+        for i in np.flatnonzero(mask):
+            schedule = self.schedules[i]
+            schedule.reset(int(self.rng.integers(2 ** 32)))
+            self.spawn_timer[i] = schedule.next_interval()
+        self.obstacle_left[mask] = np.inf
+        self.next_slot[mask] = 0
+
+    def step(self, actions):
+        """
+        Applies one action per game and advances every game by a frame.
+
+        Args:
+            actions (numpy.ndarray): NOOP or JUMP for each game.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, dict]:
+            The observations, the points scored this frame, which games
+            ended, and the total score of each game before any reset.
+        """
+        self.is_jumping |= np.asarray(actions) == JUMP
+        self.run_timers()
+        previous_bottom = self.bottom.copy()
+        self.update_players()
+        done = self.update_obstacles(np.trunc(self.speed), previous_bottom)
+        score = (self.elapsed // SCORECOUNT_OFFSET).astype(np.int64)
+        reward = score - self.score
+        self.score = score
+        info = {"score": self.score.copy()}
+        if done.any():
+            self.reset_envs(done)
+        return self.observe(), reward, done, info
+
+    def run_timers(self):
+        """
+        Advances the game clocks, spawns obstacles that are due and
+        raises the speed of games that are due a speed-up.
+        """
+        self.elapsed += self.frame_ms
+        self.spawn_timer -= self.frame_ms
+        spawning = np.flatnonzero(self.spawn_timer <= 0)
+        if spawning.size:
+            self.obstacle_left[spawning, self.next_slot[spawning]] = (
+                self.spawn_left)
+            self.next_slot[spawning] = (
+                (self.next_slot[spawning] + 1) % MAX_OBSTACLES)
+            for i in spawning:
+                self.spawn_timer[i] += self.schedules[i].next_interval()
+        self.speedup_timer -= self.frame_ms
+        speeding_up = self.speedup_timer <= 0
+        self.speed[speeding_up] += SPEED_INCREMENT
+        self.speedup_timer[speeding_up] += SPEEDUP_OFFSET
+
+    def update_players(self):
+        """Applies the jump physics of Player.update to every game."""
+        jumping = self.is_jumping
+        force = 0.5 * self.m * self.v ** 2
+        self.bottom = np.where(
+            jumping, np.floor(self.bottom - force + 0.5), self.bottom)
+        self.v = np.where(jumping, self.v - 0.5, self.v)
+        self.m = np.where(jumping & (self.v < 0), -1, self.m)
+        landed = jumping & (self.v <= -JUMP_SPEED)
+        self.is_jumping = jumping & ~landed
+        self.bottom[landed] = FLOOR
+        self.v[landed] = JUMP_SPEED
+        self.m[landed] = 1
+
+    def update_obstacles(self, speed, previous_bottom):
+        """
+        Moves the obstacles and checks each game for a collision along
+        the paths of the player and obstacles during the frame.
+
+        Args:
+            speed (numpy.ndarray): Distance obstacles move in each game.
+            previous_bottom (numpy.ndarray): Player position before the
+                frame.
+
+        Returns:
+            numpy.ndarray: Which games ended in a collision.
+        """
+        left = self.obstacle_left
+        left[left + self.obstacle_width < 0] = np.inf
+        moved = left - speed[:, None]
+        top = np.minimum(previous_bottom, self.bottom) - self.player_height
+        bottom = np.maximum(previous_bottom, self.bottom)
+        hit_x = ((moved < self.player_right)
+                 & (left + self.obstacle_width > self.player_left))
+        hit_y = ((top < self.obstacle_top + self.obstacle_height)
+                 & (bottom > self.obstacle_top))
+        self.obstacle_left = moved
+        return (hit_x & hit_y[:, None]).any(axis=1)
+
+    def observe(self):
+        """
+        Builds the observation of each game.
+
+        Returns:
+            numpy.ndarray: The observations as float32 values.
+        """
+        ahead = np.where(
+            self.obstacle_left + self.obstacle_width > self.player_left,
+            self.obstacle_left - self.player_right, np.inf)
+        distances = np.sort(ahead, axis=1)[:, :OBSERVED_OBSTACLES]
+        distances[np.isinf(distances)] = NO_OBSTACLE
+        return np.column_stack(
+            (self.bottom, self.v, self.is_jumping, self.speed,
+             distances)).astype(np.float32)
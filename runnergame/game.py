@@ -1,58 +1,55 @@
 # game.py
 
 import sys
+import time
 import pygame
-from pygame.locals import K_ESCAPE, K_UP, QUIT
-import random
-from entities import Player, Obstacle
+from pygame.locals import K_ESCAPE, K_UP, KEYDOWN, QUIT
+from simulation import Simulation
+from latency_probe import LatencyProbe
+from capture import FrameCapture
+from cpu_monitor import CpuMonitor
 from constants import *
 
 class Game:
-    """Manages the main game logic and loop."""
+    """
+    Manages the main game loop. The game rules are run by a Simulation,
+    the same one used by the server and the environments, while Game
+    feeds it input and draws it.
+    """
 
-    def __init__(self, screen, menu):
+    def __init__(self, screen, menu, clock=None):
         """
         Initializes the game.
         
         Args:
             screen (pygame.Surface): Used for rendering.
             menu (Menu): The central game menu system.
+            clock (pygame.time.Clock, optional): Paces the frames.
+                Defaults to a new pygame clock.
         """
         self.screen = screen
         self.menu = menu
-        self.clock = pygame.time.Clock() 
-        self.font = pygame.font.Font(None, FONTPT)
-        self.initialize_sprites()
+        self.clock = clock or pygame.time.Clock()
+        self.font = menu.font
+        self.latency_probe = LatencyProbe(LATENCY_BUCKET_MS)
+        self.capture = None
+        self.simulation = Simulation(menu.image_manager)
         self.initialize_background()
-        self.initialize_game_parameters()
         self.running = True
-
-    def initialize_sprites(self):
-        """Initializes player and sprite groups."""
-        self.player = Player(self.menu)
-        self.sprite_num = 0
-        self.obstacles = pygame.sprite.Group()
-        self.all_sprites = pygame.sprite.Group()
-        self.all_sprites.add(self.player)
+        self.paused = False
+        self.hidden = False
+        self.controller_presses = None
 
     def initialize_background(self):
-        """Initializes background layers and their positions."""
+        """Initializes background layers, ground tiles and their positions."""
         self.layers = self.menu.image_manager.len_bg
         self.bg_speed = [1 if i == 0 else i * 2 for i in range(self.layers)]
         self.bg_pos = [0] * self.layers
         b = [WIDTH] * self.layers
         self.bg_pos = self.bg_pos + b
-
-    def initialize_game_parameters(self):
-        """Initializes game parameters and jump physics."""
+        self.bg_canvas = None
+        self.hud_text = {}
         self.ground_pos = [x*GROUND_DIM for x in range(0, WIDTH//GROUND_DIM + 1)]
-        self.speed = DEFAULT_SPEED
-        self.score = 0
-        self.min = 0
-        self.sec = 0
-        self.v = JUMP_SPEED  # velocity
-        self.m = 1  # mass
-        self.is_jumping = False
 
     def play_game(self): 
         """Starts the main game loop, continuing until the game ends.""" 
@@ -61,10 +58,19 @@ class Game:
         while self.running:
             self.clock.tick(FPS)
             self.handle_events()
-            self.update_game_state()
+            if self.paused:
+                self.wait_while_paused()
+                continue
+            start = time.perf_counter()
+            game_over = self.simulation.step()
             self.render()
+            frame_ms = (time.perf_counter() - start) * 1000
+            self.menu.quality_manager.record(frame_ms)
+            # Generate spawns ahead only in frames with time to spare.
+            if frame_ms < 500 / FPS:
+                self.simulation.spawn_schedule.prefetch()
 
-            if self.check_collisions():
+            if game_over:
                 self.handle_game_end()
                 break
 
@@ -72,98 +78,188 @@ class Game:
         """Initializes game elements."""
         self.menu.main_menu.disable()
         self.menu.sound_manager.play_music()
-        self.set_event_timers()
+        self.set_event_filter()
+        if CAPTURE:
+            self.capture = FrameCapture(self.screen, CAPTURE_PATH,
+                                        CAPTURE_BUFFERS)
 
-    def set_event_timers(self):
-        """Sets timers for game events."""
-        pygame.time.set_timer(ADDOBSTACLE, random.randint(TIMER_MIN, TIMER_MAX))
-        pygame.time.set_timer(SCORECOUNT, SCORECOUNT_OFFSET)
-        pygame.time.set_timer(DURATION, DURATION_OFFSET)
-        pygame.time.set_timer(SPEEDUP, SPEEDUP_OFFSET)
-        pygame.time.set_timer(FRAMECHANGE, FRAMECHANGE_OFFSET)
+    def set_event_filter(self):
+        """Limits the event queue to the events handled during play."""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(GAME_EVENTS)
+
+    def clear_event_filter(self):
+        """Allows all events again so the menus receive their input."""
+        pygame.event.set_allowed(None)
 
     def handle_events(self):
+        """Handles all events waiting in the event queue."""
+        for event in pygame.event.get():
+            self.handle_event(event)
+        if self.menu.controller:
+            self.handle_controller_input()
+
+    def handle_event(self, event):
         """
-        Handles all events in game including quitting, updating player
-        and obstacle animation, increasing game speed, and updating 
-        time and score count.
+        Handles a single event in game including quitting, keyboard
+        input and window focus changes.
+
+        Args:
+            event (pygame.event.Event): The event to handle.
         """
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                self.quit_game()
-            elif event.type == FRAMECHANGE and not self.is_jumping:
-                self.handle_frame_change()
-            elif event.type == ADDOBSTACLE:
-                self.add_obstacle()
-            elif event.type == SPEEDUP:
-                self.speed += SPEED_INCREMENT
-            elif event.type == SCORECOUNT:
-                self.score += 1
-            elif event.type == DURATION:
-                self.update_time()
-                    
-        self.handle_player_input()
+        if event.type == QUIT:
+            self.quit_game()
+        elif event.type == KEYDOWN:
+            self.handle_player_input(event)
+        elif event.type in FOCUS_LOST_EVENTS:
+            self.handle_focus_lost(event)
+        elif event.type in FOCUS_GAINED_EVENTS:
+            self.handle_focus_gained(event)
+
+    def handle_focus_lost(self, event):
+        """
+        Pauses the game when the window loses focus or is hidden.
+
+        Args:
+            event (pygame.event.Event): The window event.
+        """
+        self.paused = True
+        if event.type != pygame.WINDOWFOCUSLOST:
+            self.hidden = True
+
+    def handle_focus_gained(self, event):
+        """
+        Resumes the game when the window regains focus, and resumes
+        drawing when the window is shown again.
+
+        Args:
+            event (pygame.event.Event): The window event.
+        """
+        if event.type == pygame.WINDOWFOCUSGAINED:
+            self.paused = False
+        else:
+            self.hidden = False
+        self.controller_presses = None
+
+    def wait_while_paused(self):
+        """
+        Blocks on the event queue until the window regains focus. The
+        simulation is not stepped meanwhile, so its timers resume where
+        they stopped. The pause message is only drawn while the window
+        is visible.
+        """
+        idle_monitor = CpuMonitor()
+        while self.paused and self.running:
+            if not self.hidden:
+                self.draw_paused()
+            self.handle_event(pygame.event.wait())
+        if IDLE_REPORT:
+            idle_monitor.report("Paused")
+
+    def draw_paused(self):
+        """Draws the pause message over the last rendered frame."""
+        paused_text = self.font.render("Paused", True, WHITE)
+        self.screen.blit(paused_text, paused_text.get_rect(
+            center=(WIDTH // 2, HEIGHT // 2)))
+        pygame.display.flip()
 
     def quit_game(self):
         """Handles quitting the game."""
+        self.stop_capture()
         pygame.quit()
         sys.exit()
 
-    def handle_frame_change(self):
-        """Handles player sprite animation."""
-        if self.sprite_num >= len(self.menu.image_manager.run_imgs):
-            self.sprite_num = 0
-        self.player.animate(self.sprite_num, 
-                            self.menu.image_manager.run_imgs)
-        self.sprite_num += 1
-
-    def add_obstacle(self):
-        """Adds a new obstacle to the game at a random time interval."""
-        new_obstacle = Obstacle(self.menu)
-        self.obstacles.add(new_obstacle)
-        self.all_sprites.add(new_obstacle)
-        obstacle_interval = random.randint(TIMER_MIN, TIMER_MAX)
-        pygame.time.set_timer(ADDOBSTACLE, obstacle_interval)
-
-    def update_time(self):
-        """Updates duration of current game progress."""
-        if self.sec == 59:
-            self.sec = 0
-            self.min += 1
-        else:
-            self.sec += 1
-    
-    def handle_player_input(self):
-        """Handles keyboard input from user."""
-        pressed_keys = pygame.key.get_pressed()
-        if pressed_keys[K_UP]:
-            self.is_jumping = True
-        if pressed_keys[K_ESCAPE]:
-            for sp in self.all_sprites:
-                sp.kill()
+    def handle_player_input(self, event):
+        """
+        Handles keyboard input from user.
+
+        Args:
+            event (pygame.event.Event): The KEYDOWN event to handle.
+        """
+        if event.key == K_UP:
+            self.start_jump()
+        elif event.key == K_ESCAPE:
+            self.exit_to_menu()
+
+    def handle_controller_input(self):
+        """
+        Samples the external controller and acts on buttons pressed
+        since the previous sample.
+        """
+        _, presses = self.menu.controller.sample()
+        if self.controller_presses is None:
+            self.controller_presses = presses
+        if presses[JUMP_BUTTON] > self.controller_presses[JUMP_BUTTON]:
+            self.start_jump()
+        if presses[ESCAPE_BUTTON] > self.controller_presses[ESCAPE_BUTTON]:
+            self.exit_to_menu()
+        self.controller_presses = presses
+
+    def start_jump(self):
+        """
+        Starts a jump if the player is on the ground. Jumps pressed
+        while the game is paused are ignored, as the simulation is not
+        running to carry them out.
+        """
+        if self.paused:
+            return
+        if not self.simulation.is_jumping:
+            self.latency_probe.key_pressed(time.perf_counter())
+            self.simulation.jump()
+
+    def exit_to_menu(self):
+        """Ends the game and returns to the main menu."""
+        if self.running:
+            self.simulation.obstacles.empty()
             self.menu.sound_manager.play_collision()
+            self.report_latency()
+            self.stop_capture()
+            self.clear_event_filter()
             self.menu.main_menu.enable()
             self.running = False
 
-    def update_game_state(self):
-        """Updates player and obstacle positions."""
-        self.v, self.m, self.is_jumping = self.player.update(
-            self.v, self.m, self.is_jumping)
-        self.obstacles.update(self.speed)
+    def stop_capture(self):
+        """Finishes writing captured frames when capture is enabled."""
+        if self.capture:
+            self.capture.close()
+            self.capture = None
+
+    def report_latency(self):
+        """
+        Prints the input latency histogram, and the controller read
+        latency if one is connected, when the probe is enabled.
+        """
+        if LATENCY_PROBE:
+            self.latency_probe.report()
+            if self.menu.controller:
+                self.menu.controller.report()
 
     def render(self):
         """Renders all objects to screen."""
-        self.screen.fill(BLACK)
         self.draw_parallax_background()
         self.draw_ground()
         self.draw_player()
         self.draw_obstacles()
         self.draw_score()
         self.draw_duration()
+        if self.capture:
+            self.capture.capture()
         pygame.display.flip()
+        self.latency_probe.frame_presented(
+            self.simulation.player.rect.bottom < FLOOR)
 
     def draw_parallax_background(self):
-        """Manages movement of and draws the parallaxing background."""
+        """
+        Manages movement of and draws the parallaxing background. The
+        quality tier sets how many layers are drawn and the resolution
+        they are drawn at before being scaled to the screen.
+        """
+        settings = self.menu.quality_manager.settings
+        factor = settings["resolution"]
+        canvas = self.get_background_canvas(factor)
+        canvas.fill(BLACK)
+        bg_imgs = self.menu.image_manager.get_backgrounds(factor)
+        num_drawn = settings["layers"] or self.layers
         for i in range(self.layers):
             self.bg_pos[i] -= self.bg_speed[i]
             self.bg_pos[i + self.layers] -= self.bg_speed[i]
@@ -174,14 +270,34 @@ class Game:
             if self.bg_pos[i] < -self.menu.image_manager.bg_width[i]:
                 self.bg_pos[i] = (self.bg_pos[i + self.layers] + 
                                   self.menu.image_manager.bg_width[i])
-            self.screen.blit(self.menu.image_manager.bg_imgs[i], 
-                             (self.bg_pos[i], 0))
-            self.screen.blit(self.menu.image_manager.bg_imgs[i], 
-                             (self.bg_pos[i + self.layers], 0))
+            if i < num_drawn:
+                canvas.blit(bg_imgs[i], (int(self.bg_pos[i] * factor), 0))
+                canvas.blit(bg_imgs[i], 
+                            (int(self.bg_pos[i + self.layers] * factor), 0))
+        if canvas is not self.screen:
+            pygame.transform.scale(canvas, WINDOW_SIZE, self.screen)
+
+    def get_background_canvas(self, factor):
+        """
+        Returns the surface the background is drawn on.
+
+        Args:
+            factor (float): Internal resolution relative to the window.
+
+        Returns:
+            pygame.Surface: The screen at full resolution, otherwise a
+            smaller surface in the same pixel format.
+        """
+        if factor == 1:
+            return self.screen
+        size = (round(WIDTH * factor), round(HEIGHT * factor))
+        if self.bg_canvas is None or self.bg_canvas.get_size() != size:
+            self.bg_canvas = pygame.Surface(size, 0, self.screen)
+        return self.bg_canvas
 
     def draw_ground(self):
         """Handles movement of and draws the ground tiles."""
-        self.ground_pos = [x - self.speed for x in self.ground_pos]
+        self.ground_pos = [x - self.simulation.speed for x in self.ground_pos]
         if self.ground_pos[0] < -GROUND_DIM:
             self.ground_pos.pop(0)
             self.ground_pos.append(self.ground_pos[-1] + GROUND_DIM)
@@ -190,34 +306,50 @@ class Game:
 
     def draw_player(self):
         """Draws player to screen."""
-        self.screen.blit(self.player.surf, self.player.rect)
+        player = self.simulation.player
+        self.screen.blit(player.surf, player.rect)
 
     def draw_obstacles(self):
         """Draws obstacles to screen."""
-        for sprite in self.obstacles:
-            self.screen.blit(sprite.glow_surf, sprite.glow_rect)
+        glow = self.menu.quality_manager.settings["glow"]
+        for sprite in self.simulation.obstacles:
+            if glow:
+                self.screen.blit(sprite.glow_surf, sprite.glow_rect)
             self.screen.blit(sprite.surf, sprite.rect)
 
     def draw_score(self):
         """Draws score to screen."""
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+        score_text = self.get_hud_text("score", f"Score: {self.simulation.score}")
         self.screen.blit(score_text, (10, 10))
 
     def draw_duration(self):
         """Draws current game duration to screen."""
-        duration_text = self.font.render(
-            f"Time: {self.min}:{self.sec:02}", True, WHITE)
-        d_text_width = self.font.size(f"Time: {self.min}:{self.sec:02}")[0]
+        minutes, seconds = divmod(self.simulation.seconds, 60)
+        duration_text = self.get_hud_text(
+            "duration", f"Time: {minutes}:{seconds:02}")
+        d_text_width = duration_text.get_width()
         self.screen.blit(duration_text, (WIDTH - d_text_width - 10, 10))
 
-    def check_collisions(self):
+    def get_hud_text(self, key, text):
         """
-        Checks for collisions between the player and obstacles.
+        Renders HUD text, reusing the previous rendering until the text
+        changes and the HUD interval of the quality tier has passed.
+
+        Args:
+            key (str): Identifies the HUD element.
+            text (str): The text to display.
 
         Returns:
-            bool: True if a collision is detected, False otherwise.
+            pygame.Surface: The rendered text.
         """
-        return pygame.sprite.spritecollideany(self.player, self.obstacles)
+        now = pygame.time.get_ticks()
+        interval = self.menu.quality_manager.settings["hud_interval"]
+        rendered = self.hud_text.get(key)
+        if rendered is None or (rendered[0] != text 
+                                and now - rendered[1] >= interval):
+            rendered = (text, now, self.font.render(text, True, WHITE))
+            self.hud_text[key] = rendered
+        return rendered[2]
 
     def handle_game_end(self):
         """
@@ -225,11 +357,15 @@ class Game:
         destroying all sprites, turning off all sounds, and displaying
         the game end menu.
         """
-        self.menu.update_high_score(self.score)
-        for sprite in self.all_sprites:
-            sprite.kill()
+        score = self.simulation.score
+        minutes, seconds = divmod(self.simulation.seconds, 60)
+        self.menu.update_high_score(score)
+        self.simulation.obstacles.empty()
         self.menu.sound_manager.play_collision()
-        self.menu.create_end_menu(self.score, self.min, self.sec)
-        self.menu.end_menu.mainloop(self.screen)
+        self.report_latency()
+        self.stop_capture()
+        self.clear_event_filter()
+        self.menu.create_end_menu(score, minutes, seconds)
+        self.menu.run_menu(self.menu.end_menu)
 
         self.running = False
\ No newline at end of file
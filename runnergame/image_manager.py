@@ -3,7 +3,9 @@
 import pygame
 import sys
 from pathlib import Path
-from constants import WIDTH, GROUND_DIM, PLAYER_SCALE, OBSTACLE_SCALE, GLOW_SCALE
+from constants import (WIDTH, HEIGHT, GROUND_DIM, PLAYER_SCALE, 
+                       OBSTACLE_SCALE, GLOW_SCALE, RLE_MIN_TRANSPARENCY,
+                       MEMORY_REPORT)
 
 class ImageManager:
     """Manages loading, scaling, and storing images used in the game."""
@@ -16,6 +18,9 @@ class ImageManager:
             paths_config (dict): Paths to image directories.
         """
         self.paths_config = paths_config
+        self.has_display = pygame.display.get_surface() is not None
+        self.masks = {}
+        self.scaled_bg_imgs = {}
         self.initialize_images()
         self.len_bg = len(self.bg_imgs)
         self.len_obs = len(self.obs_imgs)
@@ -37,7 +42,7 @@ class ImageManager:
             self.ground_img = self.load_image(
                 self.paths_config.get("ground"), (GROUND_DIM, GROUND_DIM))
             self.bg_imgs = self.load_images_from_directory(
-                self.paths_config.get("background"))  
+                self.paths_config.get("background"), optimize=False)  
             self.scale_background_images()
             self.initialize_glow_img()
         except FileNotFoundError as e:
@@ -45,23 +50,63 @@ class ImageManager:
             sys.exit(1)
 
     def scale_background_images(self):
-        """Scales background images based on screen size."""
+        """
+        Scales background images based on screen size and crops them to
+        the visible area of the window.
+        """
         bg_scale = (self.bg_imgs[0].get_width() / self.bg_imgs[0].get_height())
         self.bg_imgs = [
-            pygame.transform.scale(layer, (WIDTH, int(WIDTH * bg_scale))) 
+            self.optimize_image(self.crop_to_window(
+                pygame.transform.scale(layer, (WIDTH, int(WIDTH * bg_scale)))))
             for layer in self.bg_imgs]
         self.bg_width = [layer.get_width() for layer in self.bg_imgs]
 
+    def get_backgrounds(self, factor):
+        """
+        Returns the background layers scaled for an internal resolution,
+        scaling them on first use.
+
+        Args:
+            factor (float): Internal resolution relative to the window.
+
+        Returns:
+            list[pygame.Surface]: The scaled background layers.
+        """
+        if factor == 1:
+            return self.bg_imgs
+        if factor not in self.scaled_bg_imgs:
+            self.scaled_bg_imgs[factor] = [
+                self.optimize_image(self.scale_image(layer, (
+                    round(factor * layer.get_width()),
+                    round(factor * layer.get_height()))))
+                for layer in self.bg_imgs]
+        return self.scaled_bg_imgs[factor]
+
+    def crop_to_window(self, image):
+        """
+        Crops an image to the rows that can be shown in the window.
+
+        Args:
+            image (pygame.Surface): The image to be cropped.
+
+        Returns:
+            pygame.Surface: A copy of the visible part of the image.
+        """
+        visible = pygame.Rect(0, 0, WIDTH, HEIGHT).clip(image.get_rect())
+        return image.subsurface(visible).copy()
+
     def initialize_glow_img(self):
         """Loads and scales glow image."""
         glow_scale = (
             int(GLOW_SCALE[0] * self.obs_imgs[10].get_width()), 
             int(GLOW_SCALE[1] * self.obs_imgs[10].get_width()))
         self.glow_img = self.load_image(self.paths_config.get("glow"),
-                                        glow_scale)
+                                        glow_scale, optimize=False)
         self.glow_img.set_alpha(65)
+        self.glow_img = self.optimize_image(self.glow_img)
     
-    def load_images_from_directory(self, directory, scale=None, factor=False):     
+    def load_images_from_directory(self, directory, scale=None, factor=False,
+                                   optimize=True):     
         """
         Loads all images from the specified directory.
 
@@ -71,17 +116,19 @@ class ImageManager:
                 format of (x-scale, y-scale).
             factor (bool, optional): Indicates whether to scale by a 
                 factor or to specific dimensions.
+            optimize (bool, optional): Indicates whether to convert the
+                images to their cheapest pixel format. Defaults to True.
 
         Returns:
             list[pygame.Surface]: List of loaded and scaled images.
         """
         images = []
         for file in Path(directory).iterdir():
-            image = self.load_image(str(file), scale, factor)
+            image = self.load_image(str(file), scale, factor, optimize)
             images.append(image)
         return images
     
-    def load_image(self, path, scale=None, factor=False):
+    def load_image(self, path, scale=None, factor=False, optimize=True):
         """
         Loads a single image.
 
@@ -91,6 +138,8 @@ class ImageManager:
                 format of (x-scale, y-scale). Defaults to None.
             factor (bool, optional): Indicates whether to scale by a 
                 factor or by specific dimensions. Defaults to False.
+            optimize (bool, optional): Indicates whether to convert the
+                image to its cheapest pixel format. Defaults to True.
 
         Returns:
             pygame.Surface: The loaded and scaled image.
@@ -99,11 +148,14 @@ class ImageManager:
             FileNotFoundError: If the image file cannot be loaded.
         """
         try:
-            image = pygame.image.load(path).convert_alpha()
-            return (self.scale_image(image, scale if not factor else (
+            image = pygame.image.load(path)
+            if self.has_display:
+                image = image.convert_alpha()
+            image = (self.scale_image(image, scale if not factor else (
                 int(scale[0] * image.get_width()), 
                 int(scale[1] * image.get_height()))) 
                 if scale else image)
+            return self.optimize_image(image) if optimize else image
         except pygame.error as e:
             print(f"Error loading image {path}: {e}")
             raise FileNotFoundError
@@ -120,4 +172,97 @@ class ImageManager:
         Returns:
             pygame.Surface: The scaled image.
         """
-        return pygame.transform.scale(image, scale)
\ No newline at end of file
+        return pygame.transform.scale(image, scale)
+
+    def optimize_image(self, image):
+        """
+        Converts an image to the cheapest pixel format for blitting.
+        Fully opaque images drop their alpha channel, and images with
+        large transparent areas are marked for RLE acceleration. Images
+        are left unchanged when no display has been created.
+
+        Args:
+            image (pygame.Surface): The image to be optimized.
+
+        Returns:
+            pygame.Surface: The optimized image.
+        """
+        area = image.get_width() * image.get_height()
+        if not area or not self.has_display:
+            return image
+        if pygame.mask.from_surface(image, 254).count() == area:
+            return image.convert()
+        transparent = 1 - pygame.mask.from_surface(image, 0).count() / area
+        if transparent >= RLE_MIN_TRANSPARENCY:
+            image.set_alpha(image.get_alpha(), pygame.RLEACCEL)
+        return image
+
+    def get_mask(self, image):
+        """
+        Returns the collision mask of an image, creating it on first use.
+
+        Args:
+            image (pygame.Surface): The image to get the mask of.
+
+        Returns:
+            pygame.mask.Mask: The collision mask of the image.
+        """
+        if image not in self.masks:
+            self.masks[image] = pygame.mask.from_surface(image)
+        return self.masks[image]
+
+    def surface_bytes(self, image):
+        """
+        Calculates the pixel memory held by an image.
+
+        Args:
+            image (pygame.Surface): The image to measure.
+
+        Returns:
+            int: Size of the pixel buffer in bytes.
+        """
+        return image.get_pitch() * image.get_height()
+
+    def memory_report(self):
+        """
+        Calculates the pixel memory held by each group of images,
+        including the background layers scaled for lower quality tiers.
+
+        Returns:
+            dict[str, int]: Bytes held per asset group.
+        """
+        groups = {
+            "run": self.run_imgs,
+            "jump": self.jump_imgs,
+            "obstacle": self.obs_imgs,
+            "ground": [self.ground_img],
+            "background": self.bg_imgs,
+            "scaled bg": [layer for layers in self.scaled_bg_imgs.values()
+                          for layer in layers],
+            "glow": [self.glow_img],
+        }
+        return {name: sum(self.surface_bytes(image) for image in images)
+                for name, images in groups.items()}
+
+    def check_memory_budget(self, budget_mb):
+        """
+        Warns if the memory held by the images exceeds the memory
+        budget, and prints the memory held per asset group when
+        MEMORY_REPORT is enabled.
+
+        Args:
+            budget_mb (float): Memory budget for images in megabytes.
+
+        Returns:
+            bool: True if the images fit within the budget.
+        """
+        report = self.memory_report()
+        total = sum(report.values())
+        if MEMORY_REPORT:
+            for name, size in report.items():
+                print(f"{name:<12}{size / 1024:>10.1f} KB")
+            print(f"{'total':<12}{total / 1024:>10.1f} KB")
+        within_budget = total <= budget_mb * 1024 * 1024
+        if not within_budget:
+            print(f"Images exceed the memory budget of {budget_mb} MB")
+        return within_budget
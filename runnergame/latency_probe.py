@@ -0,0 +1,62 @@
+# latency_probe.py
+
+import time
+
+class LatencyProbe:
+    """Measures the time from a jump keypress to the frame showing it."""
+
+    def __init__(self, bucket_ms):
+        """
+        Initializes the probe with no recorded samples.
+
+        Args:
+            bucket_ms (int): Width of each histogram bucket in milliseconds.
+        """
+        self.bucket_ms = bucket_ms
+        self.pressed_at = None
+        self.samples = []
+
+    def key_pressed(self, timestamp):
+        """
+        Starts a measurement unless one is already in progress.
+
+        Args:
+            timestamp (float): Time of the keypress from time.perf_counter.
+        """
+        if self.pressed_at is None:
+            self.pressed_at = timestamp
+
+    def frame_presented(self, moved):
+        """
+        Completes the measurement once a frame shows the player moving.
+
+        Args:
+            moved (bool): Indicates whether the presented frame shows the
+                player away from its resting position.
+        """
+        if self.pressed_at is not None and moved:
+            self.samples.append((time.perf_counter() - self.pressed_at) * 1000)
+            self.pressed_at = None
+
+    def histogram(self):
+        """
+        Groups the recorded latencies into buckets.
+
+        Returns:
+            dict[int, int]: Number of samples keyed by the lower bound of
+            each bucket in milliseconds.
+        """
+        buckets = {}
+        for sample in self.samples:
+            bucket = int(sample // self.bucket_ms) * self.bucket_ms
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+        return dict(sorted(buckets.items()))
+
+    def report(self):
+        """Prints the latency histogram."""
+        if not self.samples:
+            return
+        print(f"Input latency over {len(self.samples)} jumps:")
+        for bucket, count in self.histogram().items():
+            print(f"{bucket:>4}-{bucket + self.bucket_ms - 1:<4} ms "
+                  f"{'#' * count} {count}")
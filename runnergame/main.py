@@ -6,6 +6,8 @@ from menu import Menu
 from image_manager import ImageManager
 from sound_manager import SoundManager
 from config_handler import ConfigHandler
+from quality import QualityManager
+from controller import open_input_device
 
 def main():
     """
@@ -26,12 +28,23 @@ def main():
     # Initialize the sound and image managers.
     sound_manager = SoundManager(paths_config)
     image_manager = ImageManager(paths_config)
+    quality_manager = QualityManager(
+        config_handler.get("quality", "tier") or "auto")
+    quality_manager.calibrate(screen, image_manager)
+    # Checked after calibration, which scales the backgrounds it tries.
+    image_manager.check_memory_budget(
+        config_handler.get("memory", "budget_mb") or constants.MEMORY_BUDGET_MB)
+    controller = open_input_device(config_handler.get("controller"))
 
     # Create and display the main menu.
-    menu = Menu(screen, sound_manager, image_manager, 
-                config_handler.get("info"))
+    menu = Menu(screen, sound_manager, image_manager, quality_manager,
+                config_handler.get("info"), controller)
     menu.create_main_menu()
-    menu.main_menu.mainloop(screen)
+    try:
+        menu.run_menu(menu.main_menu)
+    finally:
+        if controller:
+            controller.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,13 +3,15 @@
 import pygame
 import pygame_menu
 from game import Game
-from constants import (WIDTH, HEIGHT, DEFAULT, BLUE, DARK, GREEN, 
-                       ORANGE, SOLARIZED)
+from cpu_monitor import CpuMonitor
+from constants import (WIDTH, HEIGHT, FONTPT, DEFAULT, BLUE, DARK, GREEN, 
+                       ORANGE, SOLARIZED, MENU_FPS, IDLE_REPORT)
 
 class Menu:
     """Manages the game menu system."""
 
-    def __init__(self, screen, sound_manager, image_manager, info):
+    def __init__(self, screen, sound_manager, image_manager, quality_manager,
+                 info, controller=None):
         """
         Initializes the menu system.
 
@@ -17,16 +19,24 @@ class Menu:
             screen (pygame.Surface): Used for rendering.
             sound_manager (SoundManager): Used for audio control.
             image_manager (ImageManager): Used for image control.
+            quality_manager (QualityManager): Used for rendering quality.
             info (list[str]): Information to display under Info menu.
+            controller (InputDevice, optional): External controller read
+                alongside the keyboard.
         """
         self.screen = screen
         self.sound_manager = sound_manager
         self.image_manager = image_manager
+        self.quality_manager = quality_manager
         self.info = info
+        self.controller = controller
+        self.restart_requested = False
+        self.font = pygame.font.Font(None, FONTPT)
         self.high_score = 0
         self.window_theme = DARK
         self.main_menu = None
         self.end_menu = None
+        self.idle_monitor = CpuMonitor()
     
     def create_main_menu(self):
         """
@@ -151,6 +161,27 @@ class Menu:
         self.end_menu.add.button("Back to main menu", self.return_to_main_menu)
         self.end_menu.add.button("Quit", pygame.quit)
     
+    def run_menu(self, menu):
+        """
+        Runs a menu loop that only redraws when an event arrives, at no
+        more than MENU_FPS frames per second.
+
+        Args:
+            menu (pygame_menu.Menu): The menu to display.
+        """
+        self.idle_monitor.start()
+        menu.mainloop(self.screen, fps_limit=MENU_FPS, wait_for_event=True)
+
+    def report_idle(self, label):
+        """
+        Prints the CPU used while a menu was waiting for input.
+
+        Args:
+            label (str): Name of the menu.
+        """
+        if IDLE_REPORT:
+            self.idle_monitor.report(label)
+
     def update_high_score(self, score):
         """
         Updates the high score if new score is higher than current value.
@@ -161,15 +192,35 @@ class Menu:
         if score > self.high_score:
             self.high_score = score
             
+    def create_game(self):
+        """
+        Creates the Game for a new round.
+
+        Returns:
+            Game: The new game.
+        """
+        return Game(self.screen, self)
+
     def start_game(self):
-        """Initializes and runs a new Game instance."""
-        game = Game(self.screen, self)
-        game.play_game()
+        """
+        Initializes and runs new Game instances until the player stops
+        choosing to try again. Restarts are run from this loop rather
+        than from inside the End Menu, so finished games are not kept
+        alive by nested menu loops.
+        """
+        self.restart_requested = True
+        while self.restart_requested:
+            self.restart_requested = False
+            self.report_idle("Menu idle")
+            game = self.create_game()
+            game.play_game()
+            del game
+        self.idle_monitor.start()
 
     def restart_game(self):
-        """Disables the End Menu and starts a new game."""
+        """Disables the End Menu and requests a new game."""
         self.end_menu.disable()
-        self.start_game()
+        self.restart_requested = True
 
     def change_window_theme(self, selected):
         """
@@ -180,9 +231,10 @@ class Menu:
         """
         self.window_theme = selected
         self.create_main_menu()
-        self.main_menu.mainloop(self.screen)
+        self.run_menu(self.main_menu)
 
     def return_to_main_menu(self):
         """Returns to the Main Menu from the End Menu."""
+        self.report_idle("End menu idle")
         self.end_menu.disable()
         self.main_menu.enable()
\ No newline at end of file
@@ -0,0 +1,156 @@
+# quality.py
+
+import time
+import pygame
+from constants import (FPS, QUALITY_TIERS, QUALITY_WINDOW, 
+                       CALIBRATION_FRAMES, CALIBRATION_HEADROOM,
+                       QUALITY_RAISE_WINDOWS, QUALITY_REPORT)
+
+def percentile(samples, fraction):
+    """
+    Finds the value below which the given fraction of samples fall,
+    interpolating linearly between the two nearest samples.
+
+    Args:
+        samples (list[float]): The samples to examine.
+        fraction (float): The fraction, between 0 and 1.
+
+    Returns:
+        float: The value at the requested percentile.
+    """
+    ordered = sorted(samples)
+    position = fraction * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        position - lower)
+
+
+class QualityManager:
+    """
+    Selects the rendering quality tier, either as configured or from a
+    startup calibration, lowers it when frames take too long and raises
+    it again after frames have stayed fast for a while.
+    """
+
+    def __init__(self, tier="auto"):
+        """
+        Initializes the quality manager.
+
+        Args:
+            tier (str, optional): Name of a tier in QUALITY_TIERS, or
+                "auto" to calibrate and adjust the tier automatically.
+        """
+        self.tiers = list(QUALITY_TIERS)
+        self.auto = tier not in self.tiers
+        if self.auto and tier != "auto":
+            print(f"Unknown quality tier {tier}, using automatic quality")
+        self.set_tier(self.tiers[-1] if self.auto else tier)
+        self.frame_budget = 1000 / FPS
+        self.frame_times = []
+        self.fast_windows = 0
+        self.raise_windows = QUALITY_RAISE_WINDOWS
+        self.just_raised = False
+
+    def set_tier(self, tier):
+        """
+        Switches to the given tier.
+
+        Args:
+            tier (str): Name of a tier in QUALITY_TIERS.
+        """
+        self.tier = tier
+        self.settings = QUALITY_TIERS[tier]
+
+    def calibrate(self, screen, image_manager):
+        """
+        Draws the background and glow effects at each tier, from the
+        highest down, and keeps the first tier whose 95th percentile
+        frame time leaves enough headroom for the rest of the frame.
+
+        Args:
+            screen (pygame.Surface): The display surface.
+            image_manager (ImageManager): Provides the images to draw.
+        """
+        if not self.auto:
+            return
+        for tier in reversed(self.tiers):
+            self.set_tier(tier)
+            frame_times = [self.time_calibration_frame(screen, image_manager)
+                           for _ in range(CALIBRATION_FRAMES)]
+            if (percentile(frame_times, 0.95) 
+                    <= self.frame_budget * CALIBRATION_HEADROOM):
+                break
+        if QUALITY_REPORT:
+            print(f"Quality tier: {self.tier}")
+
+    def time_calibration_frame(self, screen, image_manager):
+        """
+        Draws one calibration frame at the current tier.
+
+        Args:
+            screen (pygame.Surface): The display surface.
+            image_manager (ImageManager): Provides the images to draw.
+
+        Returns:
+            float: Time taken to draw and display the frame in ms.
+        """
+        start = time.perf_counter()
+        factor = self.settings["resolution"]
+        layers = image_manager.get_backgrounds(factor)
+        target = (screen if factor == 1 else pygame.Surface(
+            layers[0].get_size(), 0, screen))
+        target.fill((0, 0, 0))
+        for layer in layers[:self.settings["layers"]]:
+            target.blit(layer, (0, 0))
+            target.blit(layer, (-layer.get_width() // 2, 0))
+        if target is not screen:
+            pygame.transform.scale(target, screen.get_size(), screen)
+        if self.settings["glow"]:
+            for x in range(0, screen.get_width(), 250):
+                screen.blit(image_manager.glow_img, (x, 0))
+        pygame.display.flip()
+        return (time.perf_counter() - start) * 1000
+
+    def record(self, frame_ms):
+        """
+        Records the time taken by a frame. Drops to the next lower tier
+        when the 95th percentile over a full window exceeds the frame
+        budget, and steps back up once enough windows in a row stay
+        within the calibration headroom. A tier that proves too slow
+        right after being raised doubles the windows needed to raise it
+        again, so the tier does not keep switching.
+
+        Args:
+            frame_ms (float): Time spent updating and drawing the frame.
+        """
+        if not self.auto:
+            return
+        self.frame_times.append(frame_ms)
+        if len(self.frame_times) < QUALITY_WINDOW:
+            return
+        index = self.tiers.index(self.tier)
+        slowest = percentile(self.frame_times, 0.95)
+        self.frame_times = []
+        if slowest > self.frame_budget:
+            self.fast_windows = 0
+            if index:
+                if self.just_raised:
+                    self.raise_windows *= 2
+                self.set_tier(self.tiers[index - 1])
+                if QUALITY_REPORT:
+                    print(f"Quality tier lowered to {self.tier}")
+            self.just_raised = False
+            return
+        self.just_raised = False
+        if slowest > self.frame_budget * CALIBRATION_HEADROOM:
+            self.fast_windows = 0
+            return
+        self.fast_windows += 1
+        if (self.fast_windows >= self.raise_windows 
+                and index + 1 < len(self.tiers)):
+            self.fast_windows = 0
+            self.just_raised = True
+            self.set_tier(self.tiers[index + 1])
+            if QUALITY_REPORT:
+                print(f"Quality tier raised to {self.tier}")
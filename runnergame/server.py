@@ -0,0 +1,312 @@
+# server.py
+
+import argparse
+import asyncio
+import struct
+import time
+from simulation import Simulation
+from image_manager import ImageManager
+from config_handler import ConfigHandler
+from constants import (FPS, SERVER_HOST, SERVER_PORT, SERVER_SESSIONS,
+                       CLIENT_BUFFER_LIMIT)
+
+# Frame layout: payload length, tick, score, flags, update and removal
+# counts, followed by the updated entities and the removed entity ids.
+HEADER = struct.Struct("<HIIBHH")
+UPDATE = struct.Struct("<HBhh")
+REMOVAL = struct.Struct("<H")
+NEW_ROUND = 1
+
+class FrameEncoder:
+    """Encodes simulation state as deltas against the last frame sent."""
+
+    def __init__(self):
+        """Initializes the encoder with no previously sent state."""
+        self.round = None
+        self.positions = {}
+
+    def encode(self, tick, simulation, round_number):
+        """
+        Encodes the entities that moved, appeared, or were removed since
+        the last encoded frame.
+
+        Args:
+            tick (int): The scheduler tick of the frame.
+            simulation (Simulation): The simulation to encode.
+            round_number (int): Identifies the current round; a change
+                resets the delta state and flags the frame.
+
+        Returns:
+            bytes: The length-prefixed frame.
+        """
+        flags = 0
+        if round_number != self.round:
+            self.round = round_number
+            self.positions = {}
+            flags |= NEW_ROUND
+        updates = []
+        seen = set()
+        for entity_id, kind, x, y in simulation.entities():
+            seen.add(entity_id)
+            last_x, last_y = self.positions.get(entity_id, (0, 0))
+            if entity_id not in self.positions or (x, y) != (last_x, last_y):
+                updates.append(UPDATE.pack(entity_id, kind,
+                                           x - last_x, y - last_y))
+                self.positions[entity_id] = (x, y)
+        removed = [entity_id for entity_id in self.positions
+                   if entity_id not in seen]
+        for entity_id in removed:
+            del self.positions[entity_id]
+        body = b"".join(updates) + b"".join(
+            REMOVAL.pack(entity_id) for entity_id in removed)
+        return HEADER.pack(HEADER.size - 2 + len(body), tick,
+                           simulation.score, flags, len(updates),
+                           len(removed)) + body
+
+
+class FrameDecoder:
+    """Rebuilds entity positions from frames made by a FrameEncoder."""
+
+    def __init__(self):
+        """Initializes the decoder with no known entities."""
+        self.entities = {}
+
+    def decode(self, frame):
+        """
+        Applies a frame to the known entity positions.
+
+        Args:
+            frame (bytes): A complete length-prefixed frame.
+
+        Returns:
+            tuple[int, int, dict]: Tick, score, and the kind and position
+            of every entity keyed by entity id.
+        """
+        _, tick, score, flags, num_updates, num_removed = (
+            HEADER.unpack_from(frame))
+        if flags & NEW_ROUND:
+            self.entities = {}
+        offset = HEADER.size
+        for _ in range(num_updates):
+            entity_id, kind, dx, dy = UPDATE.unpack_from(frame, offset)
+            _, x, y = self.entities.get(entity_id, (kind, 0, 0))
+            self.entities[entity_id] = (kind, x + dx, y + dy)
+            offset += UPDATE.size
+        for _ in range(num_removed):
+            self.entities.pop(REMOVAL.unpack_from(frame, offset)[0], None)
+            offset += REMOVAL.size
+        return tick, score, self.entities
+
+
+class TickScheduler:
+    """Wakes every waiting session once per frame at a fixed rate."""
+
+    def __init__(self, fps):
+        """
+        Initializes the scheduler.
+
+        Args:
+            fps (int): Number of ticks per second.
+        """
+        self.interval = 1 / fps
+        self.tick = 0
+        self.condition = asyncio.Condition()
+
+    async def run(self):
+        """Advances the tick counter forever, notifying all waiters."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            deadline += self.interval
+            await asyncio.sleep(max(0, deadline - loop.time()))
+            async with self.condition:
+                self.tick += 1
+                self.condition.notify_all()
+
+    async def wait(self, tick):
+        """
+        Waits until the scheduler has moved past the given tick.
+
+        Args:
+            tick (int): The last tick the caller has processed.
+
+        Returns:
+            int: The current tick.
+        """
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.tick > tick)
+            return self.tick
+
+
+class Session:
+    """A single simulation instance and the clients watching it."""
+
+    def __init__(self, simulation):
+        """
+        Initializes the session.
+
+        Args:
+            simulation (Simulation): The simulation run by the session.
+        """
+        self.simulation = simulation
+        self.round = 0
+        self.scores = []
+        self.clients = {}
+
+    def advance(self, ticks):
+        """
+        Steps the simulation, starting a new round after a collision.
+
+        Args:
+            ticks (int): Number of frames to simulate.
+        """
+        for _ in range(ticks):
+            if self.simulation.step():
+                self.scores.append(self.simulation.score)
+                self.simulation.reset()
+                self.round += 1
+
+
+class GameServer:
+    """Runs many headless game sessions and streams them to clients."""
+
+    def __init__(self, image_manager, num_sessions, seed=0):
+        """
+        Initializes the server and its sessions.
+
+        Args:
+            image_manager (ImageManager): Shared by all sessions.
+            num_sessions (int): Number of concurrent sessions.
+            seed (int, optional): Base seed; session i uses seed + i.
+        """
+        self.sessions = [Session(Simulation(image_manager, seed + i))
+                         for i in range(num_sessions)]
+        self.scheduler = TickScheduler(FPS)
+
+    async def serve(self, host=SERVER_HOST, port=SERVER_PORT, path=None):
+        """
+        Accepts clients and runs all sessions until cancelled.
+
+        Args:
+            host (str, optional): TCP address to listen on.
+            port (int, optional): TCP port to listen on.
+            path (str, optional): Unix socket path; used instead of TCP
+                when provided.
+        """
+        if path:
+            server = await asyncio.start_unix_server(self.handle_client, path)
+        else:
+            server = await asyncio.start_server(
+                self.handle_client, host, port)
+        tasks = [asyncio.create_task(self.run_session(session))
+                 for session in self.sessions]
+        try:
+            async with server:
+                await self.scheduler.run()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run_session(self, session):
+        """
+        Advances a session on every scheduler tick and sends each
+        client the changes since the last frame it received. Clients
+        that are not keeping up skip frames instead of buffering them.
+
+        Args:
+            session (Session): The session to run.
+        """
+        tick = 0
+        while True:
+            current = await self.scheduler.wait(tick)
+            session.advance(current - tick)
+            tick = current
+            for writer, encoder in list(session.clients.items()):
+                if (writer.transport.get_write_buffer_size()
+                        > CLIENT_BUFFER_LIMIT):
+                    continue
+                writer.write(encoder.encode(
+                    tick, session.simulation, session.round))
+
+    async def handle_client(self, reader, writer):
+        """
+        Subscribes a client to the session named on its first line and
+        applies its "jump" commands until it disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): Reads client commands.
+            writer (asyncio.StreamWriter): Sends frames to the client.
+        """
+        try:
+            index = int(await reader.readline())
+        except (ValueError, ConnectionError):
+            index = -1
+        if not 0 <= index < len(self.sessions):
+            writer.close()
+            return
+        session = self.sessions[index]
+        session.clients[writer] = FrameEncoder()
+        try:
+            while line := await reader.readline():
+                if line.strip() == b"jump":
+                    session.simulation.jump()
+        except ConnectionError:
+            pass
+        finally:
+            del session.clients[writer]
+            writer.close()
+
+
+def measure_sessions_per_core(image_manager, num_sessions, ticks):
+    """
+    Steps sessions as fast as possible with one encoded client each and
+    calculates how many sessions a single core can keep in real time.
+
+    Args:
+        image_manager (ImageManager): Shared by all sessions.
+        num_sessions (int): Number of sessions to run.
+        ticks (int): Number of frames to simulate per session.
+
+    Returns:
+        float: Sessions that one core can run at FPS.
+    """
+    server = GameServer(image_manager, num_sessions)
+    encoders = [FrameEncoder() for _ in server.sessions]
+    start = time.process_time()
+    for tick in range(1, ticks + 1):
+        for session, encoder in zip(server.sessions, encoders):
+            session.advance(1)
+            encoder.encode(tick, session.simulation, session.round)
+    elapsed = time.process_time() - start
+    return num_sessions * ticks / (elapsed * FPS)
+
+
+def main():
+    """Starts the game server, or measures its throughput."""
+    parser = argparse.ArgumentParser(description="Runner game server")
+    parser.add_argument("--sessions", type=int, default=SERVER_SESSIONS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--unix", help="Unix socket path to listen on")
+    parser.add_argument("--benchmark", type=int, metavar="TICKS",
+                        help="Measure sessions per core and exit")
+    args = parser.parse_args()
+
+    config_handler = ConfigHandler("config.toml")
+    image_manager = ImageManager(config_handler.get("paths"))
+
+    if args.benchmark:
+        sessions_per_core = measure_sessions_per_core(
+            image_manager, args.sessions, args.benchmark)
+        print(f"Sessions per core: {sessions_per_core:.1f}")
+        return
+
+    server = GameServer(image_manager, args.sessions, args.seed)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# simulation.py
+
+import random
+import pygame
+from entities import Player, Obstacle
+from collision import collide_any
+from spawn_schedule import SpawnSchedule
+from constants import (FPS, JUMP_SPEED, DEFAULT_SPEED, SPEED_INCREMENT,
+                       ADDOBSTACLE, SCORECOUNT, DURATION, SPEEDUP, FRAMECHANGE,
+                       SCORECOUNT_OFFSET, DURATION_OFFSET, SPEEDUP_OFFSET,
+                       FRAMECHANGE_OFFSET)
+
+PLAYER = 0
+OBSTACLE = 1
+
+class Simulation:
+    """
+    Runs the game rules, advancing one frame per step. Timers count
+    frames rather than wall-clock time, so a session is fully determined
+    by its seed and its inputs. Game draws a Simulation and feeds it
+    input; the server and the environments run it without a display.
+    """
+
+    def __init__(self, image_manager, seed=None):
+        """
+        Initializes the simulation and starts the first round.
+
+        Args:
+            image_manager (ImageManager): Provides sprite dimensions;
+                may be shared between simulations.
+            seed (int, optional): Seed for the random number generator.
+        """
+        self.image_manager = image_manager
+        self.frame_ms = 1000 / FPS
+        self.rng = random.Random(seed)
+        self.spawn_schedule = SpawnSchedule(image_manager)
+        self.reset()
+
+    def reset(self, seed=None):
+        """
+        Starts a new round.
+
+        Args:
+            seed (int, optional): Reseeds the random number generator
+                if provided.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.spawn_schedule.reset(self.rng.getrandbits(32))
+        self.player = Player(self)
+        self.obstacles = pygame.sprite.Group()
+        self.entity_ids = {self.player: 0}
+        self.next_id = 1
+        self.sprite_num = 0
+        self.speed = DEFAULT_SPEED
+        self.score = 0
+        self.seconds = 0
+        self.frame = 0
+        self.v = JUMP_SPEED
+        self.m = 1
+        self.is_jumping = False
+        self.game_over = False
+        self.timers = {
+            ADDOBSTACLE: self.spawn_schedule.next_interval(),
+            SCORECOUNT: SCORECOUNT_OFFSET,
+            DURATION: DURATION_OFFSET,
+            SPEEDUP: SPEEDUP_OFFSET,
+            FRAMECHANGE: FRAMECHANGE_OFFSET,
+        }
+
+    def jump(self):
+        """Starts a jump if the player is on the ground."""
+        if not self.game_over:
+            self.is_jumping = True
+
+    def step(self):
+        """
+        Advances the simulation by one frame.
+
+        Returns:
+            bool: True if the player collided with an obstacle.
+        """
+        if self.game_over:
+            return True
+        self.frame += 1
+        self.run_timers()
+        self.v, self.m, self.is_jumping = self.player.update(
+            self.v, self.m, self.is_jumping)
+        self.obstacles.update(self.speed)
+        for obstacle in list(self.entity_ids):
+            if not obstacle.alive() and obstacle is not self.player:
+                del self.entity_ids[obstacle]
+        self.game_over = collide_any(self.player, self.obstacles,
+                                     self.image_manager)
+        return self.game_over
+
+    def run_timers(self):
+        """Fires each timer whose interval has elapsed this frame."""
+        for event in self.timers:
+            self.timers[event] -= self.frame_ms
+            while self.timers[event] <= 0:
+                self.timers[event] += self.handle_timer(event)
+
+    def handle_timer(self, event):
+        """
+        Applies the effect of a fired timer.
+
+        Args:
+            event (int): The timer event that fired.
+
+        Returns:
+            int: Milliseconds until the timer fires again.
+        """
+        if event == ADDOBSTACLE:
+            self.add_obstacle()
+            return self.spawn_schedule.next_interval()
+        if event == SCORECOUNT:
+            self.score += 1
+            return SCORECOUNT_OFFSET
+        if event == DURATION:
+            self.seconds += 1
+            return DURATION_OFFSET
+        if event == SPEEDUP:
+            self.speed += SPEED_INCREMENT
+            return SPEEDUP_OFFSET
+        if not self.is_jumping:
+            self.handle_frame_change()
+        return FRAMECHANGE_OFFSET
+
+    def handle_frame_change(self):
+        """Handles player sprite animation."""
+        if self.sprite_num >= len(self.image_manager.run_imgs):
+            self.sprite_num = 0
+        self.player.animate(self.sprite_num, self.image_manager.run_imgs)
+        self.sprite_num += 1
+
+    def add_obstacle(self):
+        """Adds a new obstacle at the right edge of the screen."""
+        obstacle = Obstacle(self, self.rng)
+        self.obstacles.add(obstacle)
+        self.entity_ids[obstacle] = self.next_id
+        self.next_id = (self.next_id + 1) % 0x10000 or 1
+
+    def entities(self):
+        """
+        Lists the position of every entity in the simulation.
+
+        Returns:
+            list[tuple[int, int, int, int]]: Entity id, kind, x and y of
+            each entity, where kind is PLAYER or OBSTACLE.
+        """
+        return [(entity_id, PLAYER if sprite is self.player else OBSTACLE,
+                 sprite.rect.x, sprite.rect.y)
+                for sprite, entity_id in self.entity_ids.items()]
+
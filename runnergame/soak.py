@@ -0,0 +1,316 @@
+# soak.py
+
+import argparse
+import gc
+import math
+import os
+import sys
+import tracemalloc
+import pygame
+import constants as constants
+from menu import Menu
+from game import Game
+from image_manager import ImageManager
+from sound_manager import SoundManager
+from config_handler import ConfigHandler
+from quality import QualityManager, percentile
+from spawn_check import pending_intervals, planned_jumps
+
+class SoakMonitor:
+    """
+    Samples memory, object counts and frame times between rounds and
+    checks that none of them grow faster than the allowed slopes.
+    """
+
+    def __init__(self, rounds, sample_every, slopes, min_span):
+        """
+        Initializes the monitor and starts tracing allocations.
+
+        Args:
+            rounds (int): Number of rounds to play.
+            sample_every (int): Number of rounds between samples.
+            slopes (dict[str, float]): Allowed growth per 1000 rounds
+                of "memory_kb", "objects" and "frame_time_ms".
+            min_span (int): Fewest rounds the fitted samples must span
+                before a slope is judged.
+        """
+        self.rounds = rounds
+        self.sample_every = sample_every
+        self.slopes = slopes
+        self.min_span = min_span
+        self.round = 0
+        self.frame_times = []
+        self.samples = []
+        tracemalloc.start()
+
+    def record_frame(self, frame_ms):
+        """
+        Records the time taken by a frame.
+
+        Args:
+            frame_ms (float): Time spent updating and drawing the frame.
+        """
+        self.frame_times.append(frame_ms)
+
+    def next_round(self):
+        """
+        Counts a finished round, sampling when one is due.
+
+        Returns:
+            bool: True if more rounds should be played.
+        """
+        self.round += 1
+        if self.round % self.sample_every == 0 or self.round == self.rounds:
+            self.sample()
+        return self.round < self.rounds
+
+    def sample(self):
+        """Records and prints resource use after a full collection."""
+        gc.collect()
+        memory, _ = tracemalloc.get_traced_memory()
+        frame_times = self.frame_times or [0]
+        sample = {
+            "round": self.round,
+            "memory_kb": memory / 1024,
+            "objects": len(gc.get_objects()),
+            "frame_time_ms": percentile(frame_times, 0.95),
+        }
+        self.samples.append(sample)
+        self.frame_times = []
+        print(f"Round {self.round}: {sample['memory_kb']:.0f} KB traced, "
+              f"{sample['objects']} objects, frame time "
+              f"p50 {percentile(frame_times, 0.5):.2f} ms, "
+              f"p95 {sample['frame_time_ms']:.2f} ms, "
+              f"p99 {percentile(frame_times, 0.99):.2f} ms")
+
+    def slope(self, key):
+        """
+        Fits a line to the samples of a measurement, skipping the first
+        sample while caches warm up.
+
+        Args:
+            key (str): The measurement to fit.
+
+        Returns:
+            tuple[float, float] | None: Growth per 1000 rounds and its
+            standard error, or None if the samples are too few or span
+            fewer than min_span rounds.
+        """
+        samples = self.samples[1:]
+        if len(samples) < 3:
+            return None
+        rounds = [sample["round"] for sample in samples]
+        if rounds[-1] - rounds[0] < self.min_span:
+            return None
+        values = [sample[key] for sample in samples]
+        mean_round = sum(rounds) / len(rounds)
+        mean_value = sum(values) / len(values)
+        covariance = sum((r - mean_round) * (v - mean_value)
+                         for r, v in zip(rounds, values))
+        variance = sum((r - mean_round) ** 2 for r in rounds)
+        slope = covariance / variance
+        residuals = sum((v - mean_value - slope * (r - mean_round)) ** 2
+                        for r, v in zip(rounds, values))
+        error = math.sqrt(residuals / (len(samples) - 2) / variance)
+        return 1000 * slope, 1000 * error
+
+    def check(self):
+        """
+        Compares the growth of each measurement to its allowed slope. A
+        slope only fails if it exceeds the limit by more than two
+        standard errors, so noise between samples is not taken for
+        growth.
+
+        Returns:
+            bool: True if no measurement grew too fast.
+        """
+        passed = True
+        for key, limit in self.slopes.items():
+            fit = self.slope(key)
+            if fit is None:
+                print(f"{key}: not enough samples over {self.min_span} "
+                      f"rounds")
+                continue
+            slope, error = fit
+            ok = slope - 2 * error <= limit
+            passed = passed and ok
+            print(f"{key}: {slope:+.2f} +/- {error:.2f} per 1000 rounds "
+                  f"(limit {limit}) {'ok' if ok else 'FAIL'}")
+        return passed
+
+
+class SoakQualityManager(QualityManager):
+    """Quality manager that also passes frame times to a SoakMonitor."""
+
+    def __init__(self, monitor, tier="auto"):
+        """
+        Initializes the quality manager.
+
+        Args:
+            monitor (SoakMonitor): Receives the frame times.
+            tier (str, optional): Name of a tier, or "auto".
+        """
+        super().__init__(tier)
+        self.monitor = monitor
+
+    def record(self, frame_ms):
+        """
+        Records the time taken by a frame.
+
+        Args:
+            frame_ms (float): Time spent updating and drawing the frame.
+        """
+        super().record(frame_ms)
+        self.monitor.record_frame(frame_ms)
+
+
+class UncappedClock:
+    """Clock that measures frames like pygame's but never waits."""
+
+    def __init__(self):
+        """Initializes the clock."""
+        self.clock = pygame.time.Clock()
+
+    def tick(self, framerate=0):
+        """
+        Ends a frame without limiting the frame rate.
+
+        Args:
+            framerate (int, optional): Ignored.
+
+        Returns:
+            int: Milliseconds since the previous tick.
+        """
+        return self.clock.tick()
+
+
+class SoakGame(Game):
+    """
+    Game that jumps where its spawn schedule planned for a number of
+    frames and then stops jumping, so the round ends at the next
+    obstacle.
+    """
+
+    def __init__(self, screen, menu, round_frames, clock=None):
+        """
+        Initializes the game and plans its jumps.
+
+        Args:
+            screen (pygame.Surface): Used for rendering.
+            menu (Menu): The central game menu system.
+            round_frames (int): Number of frames to keep jumping for.
+            clock (pygame.time.Clock, optional): Paces the frames.
+        """
+        super().__init__(screen, menu, clock)
+        simulation = self.simulation
+        self.jumps = planned_jumps(menu.image_manager, pending_intervals(
+            simulation.spawn_schedule, simulation.timers[constants.ADDOBSTACLE],
+            round_frames))
+        self.round_frames = round_frames
+
+    def handle_events(self):
+        """Handles waiting events and jumps if one is planned."""
+        super().handle_events()
+        frame = self.simulation.frame + 1
+        if frame <= self.round_frames and frame in self.jumps:
+            self.start_jump()
+
+
+class SoakMenu(Menu):
+    """
+    Menu that plays SoakGame rounds and answers the End Menu with "Try
+    again" until the monitor has seen enough rounds, instead of waiting
+    for input.
+    """
+
+    def __init__(self, screen, sound_manager, image_manager, quality_manager,
+                 info, monitor, round_frames, uncapped):
+        """
+        Initializes the menu system.
+
+        Args:
+            screen (pygame.Surface): Used for rendering.
+            sound_manager (SoundManager): Used for audio control.
+            image_manager (ImageManager): Used for image control.
+            quality_manager (QualityManager): Used for rendering quality.
+            info (list[str]): Information to display under Info menu.
+            monitor (SoakMonitor): Counts and samples the rounds.
+            round_frames (int): Number of frames each round jumps for.
+            uncapped (bool): Runs the rounds without the FPS limit.
+        """
+        super().__init__(screen, sound_manager, image_manager,
+                         quality_manager, info)
+        self.monitor = monitor
+        self.round_frames = round_frames
+        self.uncapped = uncapped
+
+    def create_game(self):
+        """
+        Creates a SoakGame for a new round.
+
+        Returns:
+            SoakGame: The new game.
+        """
+        return SoakGame(self.screen, self, self.round_frames,
+                        UncappedClock() if self.uncapped else None)
+
+    def run_menu(self, menu):
+        """
+        Restarts the game from the End Menu while rounds remain.
+
+        Args:
+            menu (pygame_menu.Menu): The menu that would be displayed.
+        """
+        if menu is self.end_menu and self.monitor.next_round():
+            self.restart_game()
+
+
+def main():
+    """
+    Plays rounds back to back under the dummy SDL drivers and exits
+    with a non-zero status if resource use drifts. Under the dummy
+    video driver the rounds run as fast as they can be drawn.
+    """
+    config_handler = ConfigHandler("config.toml")
+    soak_config = config_handler.get("soak")
+    parser = argparse.ArgumentParser(description="Runner game soak test")
+    parser.add_argument("--rounds", type=int,
+                        default=soak_config.get("rounds", 1000))
+    parser.add_argument("--sample-every", type=int,
+                        default=soak_config.get("sample_every", 20))
+    parser.add_argument("--min-span", type=int,
+                        default=soak_config.get("min_span", 100))
+    parser.add_argument("--round-frames", type=int,
+                        default=soak_config.get("round_frames", 900))
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.init()
+    pygame.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(constants.WINDOW_SIZE)
+
+    monitor = SoakMonitor(args.rounds, args.sample_every, {
+        "memory_kb": soak_config.get("memory_slope_kb", 256),
+        "objects": soak_config.get("objects_slope", 1000),
+        "frame_time_ms": soak_config.get("frame_time_slope_ms", 1.0),
+    }, args.min_span)
+    paths_config = config_handler.get("paths")
+    sound_manager = SoundManager(paths_config)
+    image_manager = ImageManager(paths_config)
+    quality_manager = SoakQualityManager(
+        monitor, config_handler.get("quality", "tier") or "auto")
+    quality_manager.calibrate(screen, image_manager)
+    menu = SoakMenu(screen, sound_manager, image_manager, quality_manager,
+                    config_handler.get("info"), monitor, args.round_frames,
+                    os.environ["SDL_VIDEODRIVER"] == "dummy")
+    menu.create_main_menu()
+    menu.start_game()
+
+    passed = monitor.check()
+    pygame.quit()
+    sys.exit(0 if passed else 1)
+
+if __name__ == "__main__":
+    main()
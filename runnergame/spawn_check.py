@@ -0,0 +1,132 @@
+# spawn_check.py
+
+import argparse
+import math
+import sys
+import numpy as np
+from simulation import Simulation
+from environment import VectorRunnerEnv, NOOP, JUMP
+from spawn_schedule import SpawnSchedule
+from image_manager import ImageManager
+from config_handler import ConfigHandler
+from constants import FPS, TIMER_MIN, ADDOBSTACLE
+
+def pending_intervals(schedule, first, frames):
+    """
+    Generates enough of a schedule to cover a number of frames and
+    lists the spawn intervals a game will use, in order.
+
+    Args:
+        schedule (SpawnSchedule): The schedule used by the game.
+        first (float): The interval the game has already taken.
+        frames (int): Number of frames the game will be played for.
+
+    Returns:
+        list[float]: The intervals between spawns.
+    """
+    spawns = math.ceil(frames * 1000 / FPS / TIMER_MIN)
+    while len(schedule.intervals) < spawns:
+        schedule.generate_chunk()
+    return [first, *schedule.intervals]
+
+def planned_jumps(image_manager, intervals):
+    """
+    Replays the planning of a schedule to find the frames in which a
+    jump should start.
+
+    Args:
+        image_manager (ImageManager): Provides sprite dimensions.
+        intervals (list[float]): The intervals between spawns.
+
+    Returns:
+        set[int]: The frames in which to jump.
+    """
+    planner = SpawnSchedule(image_manager)
+    jumps = set()
+    for interval in intervals:
+        jump_start = planner.plan_jump(planner.time + interval)
+        planner.time += interval
+        planner.jump_start = jump_start
+        if jump_start is not None:
+            jumps.add(jump_start)
+    return jumps
+
+def check_simulation(image_manager, seeds, frames):
+    """
+    Plays a Simulation for each seed, jumping where the schedule
+    planned, and reports the games that ended in a collision.
+
+    Args:
+        image_manager (ImageManager): Provides sprite dimensions.
+        seeds (int): Number of seeds to play.
+        frames (int): Number of frames to play each game for.
+
+    Returns:
+        int: Number of games lost.
+    """
+    simulation = Simulation(image_manager)
+    lost = 0
+    for seed in range(seeds):
+        simulation.reset(seed)
+        jumps = planned_jumps(image_manager, pending_intervals(
+            simulation.spawn_schedule, simulation.timers[ADDOBSTACLE],
+            frames))
+        for frame in range(1, frames + 1):
+            if frame in jumps:
+                simulation.jump()
+            if simulation.step():
+                print(f"Simulation seed {seed} lost in frame {frame}")
+                lost += 1
+                break
+    return lost
+
+def check_vector_env(image_manager, seed, num_envs, frames):
+    """
+    Plays a batch of VectorRunnerEnv games, jumping where each game's
+    schedule planned, and reports the games that ended in a collision.
+
+    Args:
+        image_manager (ImageManager): Provides sprite dimensions.
+        seed (int): Seed for the batch.
+        num_envs (int): Number of games in the batch.
+        frames (int): Number of frames to play each game for.
+
+    Returns:
+        int: Number of games lost.
+    """
+    env = VectorRunnerEnv(image_manager, num_envs)
+    env.reset(seed)
+    actions = np.full((frames + 1, num_envs), NOOP)
+    for i, schedule in enumerate(env.schedules):
+        jumps = planned_jumps(image_manager, pending_intervals(
+            schedule, env.spawn_timer[i], frames))
+        actions[[frame for frame in jumps if frame <= frames], i] = JUMP
+    lost = np.zeros(num_envs, dtype=bool)
+    for frame in range(1, frames + 1):
+        _, _, done, _ = env.step(actions[frame])
+        for i in np.flatnonzero(done & ~lost):
+            print(f"Vector game {i} lost in frame {frame}")
+        lost |= done
+    return int(np.count_nonzero(lost))
+
+def main():
+    """
+    Checks that every game can be won by jumping where the spawn
+    schedule planned, and exits with a non-zero status otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Spawn schedule check")
+    parser.add_argument("--seeds", type=int, default=200)
+    parser.add_argument("--envs", type=int, default=64)
+    parser.add_argument("--frames", type=int, default=8000)
+    args = parser.parse_args()
+
+    config_handler = ConfigHandler("config.toml")
+    image_manager = ImageManager(config_handler.get("paths"))
+    lost = check_simulation(image_manager, args.seeds, args.frames)
+    print(f"Simulation: {args.seeds - lost} of {args.seeds} games won")
+    lost_vector = check_vector_env(image_manager, 0, args.envs, args.frames)
+    print(f"Vector env: {args.envs - lost_vector} of {args.envs} games won")
+    sys.exit(1 if lost or lost_vector else 0)
+
+if __name__ == "__main__":
+    main()
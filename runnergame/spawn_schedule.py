@@ -0,0 +1,215 @@
+# spawn_schedule.py
+
+import math
+import random
+from collections import deque
+from entities import Player, Obstacle
+from constants import (FPS, JUMP_SPEED, DEFAULT_SPEED, SPEED_INCREMENT,
+                       SPEEDUP_OFFSET, TIMER_MIN, TIMER_MAX, SPAWN_CHUNK,
+                       SPAWN_LOW_WATER, SPAWN_ATTEMPTS, SPAWN_SLACK)
+
+class SpawnSchedule:
+    """
+    Generates the intervals between obstacle spawns in chunks ahead of
+    time. Each interval is drawn from TIMER_MIN to TIMER_MAX and kept
+    only if, at the speed the game will have reached, some sequence of
+    jumps still clears every obstacle scheduled so far. Feasibility is
+    judged with the widest player and obstacle frames and the tallest
+    obstacle frame, so it errs towards rejecting gaps.
+    """
+
+    def __init__(self, image_manager, seed=None):
+        """
+        Measures the jump arc and sprite bounds and starts a schedule.
+
+        Args:
+            image_manager (ImageManager): Provides sprite dimensions.
+            seed (int, optional): Seed for the random number generator.
+        """
+        self.image_manager = image_manager
+        self.frame_ms = 1000 / FPS
+        self.rng = random.Random()
+        self.speeds = [DEFAULT_SPEED]
+        self.measure_sprites()
+        self.measure_jump()
+        self.reset(seed)
+
+    def measure_sprites(self):
+        """Finds the bounds of the player and obstacles near each other."""
+        images = self.image_manager
+        player = Player(self)
+        obstacle = Obstacle(self, self.rng)
+        obstacle_width = max(img.get_width() for img in images.obs_imgs)
+        obstacle_height = max(img.get_height() for img in images.obs_imgs)
+        self.player = player
+        self.player_left = player.rect.left
+        self.player_right = player.rect.left + max(
+            img.get_width() for img in images.run_imgs + images.jump_imgs)
+        self.obstacle_width = obstacle_width
+        self.obstacle_top = obstacle.rect.centery - obstacle_height // 2
+        self.spawn_left = obstacle.rect.centerx - obstacle_width // 2
+
+    def measure_jump(self):
+        """
+        Runs the player's jump physics to find the frames of a jump in
+        which the player is above the obstacles, and its length.
+        """
+        v, m, is_jumping = JUMP_SPEED, 1, True
+        clear = []
+        while is_jumping:
+            v, m, is_jumping = self.player.update(v, m, is_jumping)
+            clear.append(self.player.rect.bottom <= self.obstacle_top)
+        self.jump_frames = len(clear)
+        self.clear_start = clear.index(True)
+        self.clear_end = len(clear) - 1 - clear[::-1].index(True)
+
+    def reset(self, seed=None):
+        """
+        Starts a new schedule at the beginning of a game.
+
+        Args:
+            seed (int, optional): Reseeds the random number generator
+                if provided.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.intervals = deque()
+        self.time = 0
+        self.jump_start = None
+
+    def next_interval(self):
+        """
+        Returns the time until the next obstacle spawns, generating a
+        chunk first if none are ready.
+
+        Returns:
+            int: Milliseconds until the next spawn.
+        """
+        if not self.intervals:
+            self.generate_chunk()
+        return self.intervals.popleft()
+
+    def prefetch(self):
+        """Generates a chunk if few intervals are left."""
+        if len(self.intervals) < SPAWN_LOW_WATER:
+            self.generate_chunk()
+
+    def generate_chunk(self):
+        """Appends SPAWN_CHUNK feasible intervals to the schedule."""
+        for _ in range(SPAWN_CHUNK):
+            for _ in range(SPAWN_ATTEMPTS):
+                interval = self.rng.randint(TIMER_MIN, TIMER_MAX)
+                jump_start = self.plan_jump(self.time + interval)
+                if jump_start is not False:
+                    break
+            else:
+                interval = TIMER_MAX
+                jump_start = self.plan_jump(self.time + interval)
+                while jump_start is False:
+                    interval += math.ceil(self.frame_ms)
+                    jump_start = self.plan_jump(self.time + interval)
+            self.time += interval
+            self.jump_start = jump_start
+            self.intervals.append(interval)
+
+    def plan_jump(self, spawn_time):
+        """
+        Finds the jump that clears an obstacle spawned at the given time
+        after the obstacles already scheduled.
+
+        Args:
+            spawn_time (float): Game time of the spawn in ms.
+
+        Returns:
+            int | None | bool: The frame the jump starts in, or False if
+            no jump can clear the obstacle. An obstacle too slow for any
+            single jump to clear returns None, as no spacing can help it.
+        """
+        first, last = self.danger_frames(spawn_time)
+        if last - first > self.clear_end - self.clear_start:
+            return None
+        if (self.jump_start is not None
+                and self.jump_start + self.clear_start <= first
+                and last <= self.jump_start + self.clear_end):
+            return self.jump_start
+        earliest = (0 if self.jump_start is None
+                    else self.jump_start + self.jump_frames)
+        jump_start = max(earliest, last - self.clear_end)
+        return jump_start if jump_start + self.clear_start <= first else False
+
+    def danger_frames(self, spawn_time):
+        """
+        Finds the frames in which an obstacle is close enough to the
+        player to collide, including the frame before it arrives since
+        collisions are swept across each frame. The window is widened by
+        SPAWN_SLACK frames on each side, as timers fire on whole frames
+        and may fire a frame late.
+
+        Args:
+            spawn_time (float): Game time of the spawn in ms.
+
+        Returns:
+            tuple[int, int]: The first and last frame of danger.
+        """
+        frame = math.ceil(spawn_time / self.frame_ms)
+        arrive = self.travel(frame, self.spawn_left - self.player_right + 1)
+        leave = self.travel(frame, self.spawn_left + self.obstacle_width
+                            - self.player_left)
+        return arrive - 1 - SPAWN_SLACK, leave - 1 + SPAWN_SLACK
+
+    def travel(self, frame, distance):
+        """
+        Finds the frame by whose end an obstacle that starts moving in
+        the given frame has travelled at least a distance. The speed is
+        constant between speed-ups, so each stretch between them is
+        covered in one step.
+
+        Args:
+            frame (int): The first frame in which the obstacle moves.
+            distance (int): The distance to travel.
+
+        Returns:
+            int: The frame in which the distance is reached.
+        """
+        while True:
+            speedups = self.speedups(frame)
+            step = int(self.speed(frame))
+            boundary = math.ceil((speedups + 1) * SPEEDUP_OFFSET
+                                 / self.frame_ms)
+            while self.speedups(boundary - 1) > speedups:
+                boundary -= 1
+            while self.speedups(boundary) == speedups:
+                boundary += 1
+            needed = max(1, math.ceil(distance / step))
+            if frame + needed <= boundary:
+                return frame + needed - 1
+            distance -= step * (boundary - frame)
+            frame = boundary
+
+    def speed(self, frame):
+        """
+        Returns the game speed in a frame, adding the increments one at
+        a time as the game does so the rounding matches.
+
+        Args:
+            frame (int): The frame number.
+
+        Returns:
+            float: The speed of the obstacles.
+        """
+        speedups = self.speedups(frame)
+        while len(self.speeds) <= speedups:
+            self.speeds.append(self.speeds[-1] + SPEED_INCREMENT)
+        return self.speeds[speedups]
+
+    def speedups(self, frame):
+        """
+        Counts the speed-ups that have happened by a frame.
+
+        Args:
+            frame (int): The frame number.
+
+        Returns:
+            int: The number of speed-ups.
+        """
+        return int(frame * self.frame_ms // SPEEDUP_OFFSET)